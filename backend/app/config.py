@@ -2,6 +2,25 @@
 from pydantic_settings import BaseSettings
 from pydantic import Field
 from pathlib import Path
+from functools import lru_cache
+from typing import Literal, Set
+
+
+# Storage roots already created by ensure_dir in this process
+_ENSURED: Set[Path] = set()
+
+
+def ensure_dir(path: Path):
+    """
+    Create a fixed storage root (and parents) once per process.
+    
+    Later calls are a set lookup, so only use it for the fixed set of
+    storage roots; per-job directories should call mkdir directly.
+    """
+    if path in _ENSURED:
+        return
+    path.mkdir(parents=True, exist_ok=True)
+    _ENSURED.add(path)
 
 
 class Settings(BaseSettings):
@@ -14,6 +33,10 @@ class Settings(BaseSettings):
         env="NANO_BANANA_API_URL"
     )
     nano_banana_timeout: int = Field(default=60, env="NANO_BANANA_TIMEOUT")
+    nano_banana_request_format: Literal["json", "multipart"] = Field(
+        default="json",
+        env="NANO_BANANA_REQUEST_FORMAT"
+    )
     
     # Storage paths
     storage_path: Path = Field(default=Path("./storage"), env="STORAGE_PATH")
@@ -22,15 +45,28 @@ class Settings(BaseSettings):
     max_image_size_mb: int = Field(default=10, env="MAX_IMAGE_SIZE_MB")
     max_image_dimension: int = Field(default=2048, env="MAX_IMAGE_DIMENSION")
     work_image_size: int = Field(default=1536, env="WORK_IMAGE_SIZE")
+    pose_input_size: int = Field(default=512, env="POSE_INPUT_SIZE")
+    pose_model_complexity: int = Field(default=2, ge=0, le=2, env="POSE_MODEL_COMPLEXITY")
+    
+    # Segmentation
+    segmentation_model: str = Field(default="u2net", env="SEGMENTATION_MODEL")
+    segmentation_alpha_matting: bool = Field(default=False, env="SEGMENTATION_ALPHA_MATTING")
+    segmentation_input_size: int = Field(default=512, env="SEGMENTATION_INPUT_SIZE")
     
     # Quality control
     quality_threshold: float = Field(default=0.7, env="QUALITY_THRESHOLD")
     max_retries: int = Field(default=2, env="MAX_RETRIES")
+    quality_fail_fast: bool = Field(default=False, env="QUALITY_FAIL_FAST")
+    
+    # Caching
+    garment_cache_size: int = Field(default=8, env="GARMENT_CACHE_SIZE")
     
     # Server
     host: str = Field(default="0.0.0.0", env="HOST")
     port: int = Field(default=8000, env="PORT")
     workers: int = Field(default=1, env="WORKERS")
+    job_concurrency: int = Field(default=2, ge=1, env="JOB_CONCURRENCY")
+    job_ttl_seconds: int = Field(default=3600, env="JOB_TTL_SECONDS")
     
     # Debug
     debug: bool = Field(default=False, env="DEBUG")
@@ -64,8 +100,19 @@ class Settings(BaseSettings):
             self.results_path,
             self.artifacts_path
         ]:
-            path.mkdir(parents=True, exist_ok=True)
+            ensure_dir(path)
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """
+    Get the cached application settings.
+    
+    The .env file is parsed once per process; use as a FastAPI dependency
+    so tests can override it via app.dependency_overrides.
+    """
+    return Settings()
 
 
 # Global settings instance
-settings = Settings()
+settings = get_settings()
@@ -1,17 +1,20 @@
 """FastAPI application for AI Virtual Try-On service."""
-from fastapi import FastAPI, File, UploadFile, Form, HTTPException
+from fastapi import FastAPI, File, UploadFile, Form, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from contextlib import asynccontextmanager
-import uuid
+import asyncio
+import secrets
 from typing import Optional
 from pathlib import Path
 
-from .config import settings
+from .config import Settings, settings, get_settings
 from .models.job import Job, JobStatus
 from .models.requests import TryOnRequest, TryOnResponse, StatusResponse
 from .workers import job_queue, start_worker
+from .services.http_client import close_client
+from .utils.validation import MIME_TYPE_EXTENSIONS
 
 
 @asynccontextmanager
@@ -32,6 +35,70 @@ async def lifespan(app: FastAPI):
     
     # Shutdown
     print("Shutting down service...")
+    await close_client()
+
+
+# Uploads are copied to disk in chunks of this size
+UPLOAD_CHUNK_SIZE = 1 << 20
+
+
+def _open_upload(path: Path):
+    """
+    Open upload destination for writing.
+    
+    The storage directories normally exist already, so skip the mkdir and
+    only create the parent if the open fails (e.g. it was removed while
+    the server was running).
+    """
+    try:
+        return open(path, "wb")
+    except FileNotFoundError:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        return open(path, "wb")
+
+
+def _upload_extension(upload: UploadFile) -> str:
+    """
+    Get the storage file extension for an upload from its content type.
+    
+    The client-supplied filename is never used to build storage paths.
+    
+    Raises:
+        HTTPException: 415 if the content type is not an allowed image type
+    """
+    ext = MIME_TYPE_EXTENSIONS.get(upload.content_type)
+    if ext is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Unsupported image type: {upload.content_type}. "
+                   f"Allowed: {', '.join(MIME_TYPE_EXTENSIONS)}"
+        )
+    return ext
+
+
+async def _save_upload(upload: UploadFile, path: Path) -> str:
+    """
+    Copy an uploaded file to disk in chunks.
+    
+    Disk writes run in a worker thread so several uploads can be written
+    at once without blocking the event loop.
+    
+    Args:
+        upload: Uploaded file
+        path: Destination path
+        
+    Returns:
+        Destination path as string
+    """
+    with _open_upload(path) as f:
+        while chunk := await upload.read(UPLOAD_CHUNK_SIZE):
+            await asyncio.to_thread(f.write, chunk)
+    return str(path)
+
+
+async def _no_upload() -> None:
+    """Placeholder for an image given by URL instead of upload."""
+    return None
 
 
 # Create FastAPI app
@@ -39,6 +106,7 @@ app = FastAPI(
     title="AI Virtual Try-On Service",
     description="AI-powered virtual clothing try-on service",
     version="1.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -88,7 +156,8 @@ async def submit_tryon(
     preserve_face: bool = Form(True),
     preserve_background: bool = Form(True),
     realism_level: int = Form(3),
-    max_retries: int = Form(2)
+    max_retries: int = Form(2),
+    settings: Settings = Depends(get_settings)
 ):
     """
     Submit a virtual try-on job.
@@ -96,32 +165,30 @@ async def submit_tryon(
     Accepts either file uploads or URLs for user and product images.
     """
     # Generate job ID
-    job_id = str(uuid.uuid4())
-    
-    # Handle user image
-    user_image_path = None
-    if user_image:
-        # Save uploaded file
-        upload_path = settings.uploads_path / f"{job_id}_user{Path(user_image.filename).suffix}"
-        with open(upload_path, "wb") as f:
-            content = await user_image.read()
-            f.write(content)
-        user_image_path = str(upload_path)
-    elif not user_image_url:
+    job_id = secrets.token_hex(16)
+    
+    if not user_image and not user_image_url:
         raise HTTPException(status_code=400, detail="Either user_image file or user_image_url must be provided")
     
-    # Handle product image
-    product_image_path = None
-    if product_image:
-        # Save uploaded file
-        upload_path = settings.products_path / f"{job_id}_product{Path(product_image.filename).suffix}"
-        with open(upload_path, "wb") as f:
-            content = await product_image.read()
-            f.write(content)
-        product_image_path = str(upload_path)
-    elif not product_image_url:
+    if not product_image and not product_image_url:
         raise HTTPException(status_code=400, detail="Either product_image file or product_image_url must be provided")
     
+    # Reject unsupported uploads before anything is written or queued
+    user_ext = _upload_extension(user_image) if user_image else None
+    product_ext = _upload_extension(product_image) if product_image else None
+    
+    # Save uploaded files concurrently
+    user_save = (
+        _save_upload(user_image, settings.uploads_path / f"{job_id}_user{user_ext}")
+        if user_image else _no_upload()
+    )
+    product_save = (
+        _save_upload(product_image, settings.products_path / f"{job_id}_product{product_ext}")
+        if product_image else _no_upload()
+    )
+    
+    user_image_path, product_image_path = await asyncio.gather(user_save, product_save)
+    
     # Create job
     job = Job(
         job_id=job_id,
@@ -149,7 +216,7 @@ async def submit_tryon(
 
 
 @app.get("/api/tryon/status/{job_id}", response_model=StatusResponse)
-async def get_status(job_id: str):
+async def get_status(job_id: str, settings: Settings = Depends(get_settings)):
     """Get status of a try-on job."""
     job = await job_queue.get_job(job_id)
     
@@ -165,15 +232,15 @@ async def get_status(job_id: str):
         error_code=job.error_code,
         error_message=job.error_message,
         retry_count=job.retry_count,
-        created_at=job.created_at.isoformat(),
-        updated_at=job.updated_at.isoformat(),
-        started_at=job.started_at.isoformat() if job.started_at else None,
-        completed_at=job.completed_at.isoformat() if job.completed_at else None
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+        started_at=job.started_at,
+        completed_at=job.completed_at
     )
 
 
 @app.get("/api/tryon/result/{job_id}")
-async def get_result(job_id: str):
+async def get_result(job_id: str, settings: Settings = Depends(get_settings)):
     """Get result image for a completed job."""
     job = await job_queue.get_job(job_id)
     
@@ -2,7 +2,7 @@
 from enum import Enum
 from datetime import datetime
 from typing import Optional, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class JobStatus(str, Enum):
@@ -30,6 +30,14 @@ class ErrorCode(str, Enum):
 class Job(BaseModel):
     """Job data model for tracking try-on requests."""
     
+    # Assignments in the mark_* transitions set already-valid values,
+    # so they are not re-validated
+    model_config = ConfigDict(
+        use_enum_values=True,
+        validate_assignment=False,
+        extra="ignore"
+    )
+    
     job_id: str = Field(..., description="Unique job identifier")
     status: JobStatus = Field(default=JobStatus.QUEUED, description="Current job status")
     
@@ -66,30 +74,30 @@ class Job(BaseModel):
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     
-    class Config:
-        use_enum_values = True
-    
     def mark_processing(self):
         """Mark job as processing."""
+        now = datetime.utcnow()
         self.status = JobStatus.PROCESSING
-        self.started_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        self.started_at = now
+        self.updated_at = now
     
     def mark_done(self, result_url: str, quality_score: float):
         """Mark job as successfully completed."""
         self.status = JobStatus.DONE
         self.result_image_url = result_url
         self.quality_score = quality_score
-        self.completed_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        self.completed_at = now
+        self.updated_at = now
     
     def mark_failed(self, error_code: ErrorCode, error_message: str):
         """Mark job as failed."""
         self.status = JobStatus.FAILED
         self.error_code = error_code
         self.error_message = error_message
-        self.completed_at = datetime.utcnow()
-        self.updated_at = datetime.utcnow()
+        now = datetime.utcnow()
+        self.completed_at = now
+        self.updated_at = now
     
     def can_retry(self) -> bool:
         """Check if job can be retried."""
@@ -1,4 +1,5 @@
 """API request and response models."""
+from datetime import datetime
 from typing import Optional, Dict
 from pydantic import BaseModel, Field
 from .job import JobStatus, ErrorCode
@@ -51,7 +52,7 @@ class StatusResponse(BaseModel):
     
     # Metadata
     retry_count: int = 0
-    created_at: str
-    updated_at: str
-    started_at: Optional[str] = None
-    completed_at: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
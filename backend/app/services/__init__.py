@@ -9,4 +9,5 @@ __all__ = [
     "quality_control",
     "nano_api",
     "storage",
+    "http_client",
 ]
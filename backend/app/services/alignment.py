@@ -1,7 +1,7 @@
 """Stage 4: Garment alignment and warping onto person."""
 import cv2
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Optional
 
 from ..models.job import ErrorCode
 from ..utils.image_utils import calculate_angle, distance
@@ -29,11 +29,13 @@ def calculate_transform_params(
     Returns:
         Dictionary with scale, angle, translation
     """
-    # Calculate shoulder width
-    garment_shoulder_width = distance(
-        garment_anchors['left_shoulder'],
-        garment_anchors['right_shoulder']
-    )
+    # Calculate shoulder width (precomputed at garment prep when available)
+    garment_shoulder_width = garment_anchors.get('_shoulder_width')
+    if garment_shoulder_width is None:
+        garment_shoulder_width = distance(
+            garment_anchors['left_shoulder'],
+            garment_anchors['right_shoulder']
+        )
     
     person_shoulder_width = distance(
         person_keypoints['left_shoulder'],
@@ -44,10 +46,12 @@ def calculate_transform_params(
     scale = person_shoulder_width / garment_shoulder_width if garment_shoulder_width > 0 else 1.0
     
     # Calculate rotation angle (based on shoulder line)
-    garment_angle = calculate_angle(
-        garment_anchors['left_shoulder'],
-        garment_anchors['right_shoulder']
-    )
+    garment_angle = garment_anchors.get('_shoulder_angle')
+    if garment_angle is None:
+        garment_angle = calculate_angle(
+            garment_anchors['left_shoulder'],
+            garment_anchors['right_shoulder']
+        )
     
     person_angle = calculate_angle(
         person_keypoints['left_shoulder'],
@@ -83,7 +87,7 @@ def apply_affine_transform(
     
     Args:
         garment_image: Garment image (RGBA or BGR)
-        garment_mask: Garment binary mask
+        garment_mask: Garment binary mask (RGBA input uses its alpha channel)
         transform_params: Transformation parameters
         output_shape: Output image shape (h, w)
         
@@ -105,37 +109,30 @@ def apply_affine_transform(
     M[0, 2] += transform_params['tx']
     M[1, 2] += transform_params['ty']
     
-    # Apply to image
+    # Warp image and mask in a single pass so the inverse mapping and
+    # interpolation weights are shared. RGBA garments already carry the
+    # mask in their alpha channel; BGR garments get it stacked on.
     if garment_image.shape[2] == 4:
-        # Handle RGBA separately
-        transformed = cv2.warpAffine(
-            garment_image,
-            M,
-            (w, h),
-            flags=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_CONSTANT,
-            borderValue=(0, 0, 0, 0)
-        )
+        stack = garment_image
     else:
-        transformed = cv2.warpAffine(
-            garment_image,
-            M,
-            (w, h),
-            flags=cv2.INTER_LINEAR,
-            borderMode=cv2.BORDER_CONSTANT,
-            borderValue=(0, 0, 0)
-        )
+        stack = np.dstack([garment_image, garment_mask])
     
-    # Apply to mask
-    transformed_mask = cv2.warpAffine(
-        garment_mask,
+    warped = cv2.warpAffine(
+        stack,
         M,
         (w, h),
         flags=cv2.INTER_LINEAR,
         borderMode=cv2.BORDER_CONSTANT,
-        borderValue=0
+        borderValue=(0, 0, 0, 0)
     )
     
+    # Split back into image and mask (views, no copy)
+    if garment_image.shape[2] == 4:
+        transformed = warped
+    else:
+        transformed = warped[:, :, :3]
+    transformed_mask = warped[:, :, 3]
+    
     # Threshold mask to binary
     _, transformed_mask = cv2.threshold(transformed_mask, 127, 255, cv2.THRESH_BINARY)
     
@@ -147,7 +144,8 @@ def composite_garment_on_person(
     garment_image: np.ndarray,
     garment_mask: np.ndarray,
     torso_mask: np.ndarray,
-    arms_mask: np.ndarray
+    arms_mask: np.ndarray,
+    out: Optional[np.ndarray] = None
 ) -> np.ndarray:
     """
     Composite garment onto person, handling occlusions.
@@ -158,11 +156,14 @@ def composite_garment_on_person(
         garment_mask: Transformed garment mask
         torso_mask: Person torso mask
         arms_mask: Person arms mask
+        out: Optional output buffer shaped like person_image; may be
+            person_image itself to composite in place
         
     Returns:
-        Composited image
+        Composited image (out, if provided)
     """
-    result = person_image.copy()
+    if out is None:
+        out = np.empty_like(person_image)
     
     # Convert garment to BGR if RGBA
     if garment_image.shape[2] == 4:
@@ -173,25 +174,29 @@ def composite_garment_on_person(
         garment_alpha = garment_mask
     
     # Create composite mask
-    # Garment should be visible on torso, but occluded by arms
+    # Garment should be visible on torso, but occluded by arms.
+    # Masks are binary (0/255), so a saturating subtract realizes AND NOT
+    # in place without materializing the inverted arms mask.
     composite_mask = cv2.bitwise_and(garment_mask, torso_mask)
-    composite_mask = cv2.bitwise_and(composite_mask, cv2.bitwise_not(arms_mask))
-    
-    # Blend garment using mask
-    # Normalize mask to 0-1 range
-    alpha = composite_mask.astype(float) / 255.0
-    alpha = np.expand_dims(alpha, axis=2)
-    
-    # Also use garment alpha if available
-    if garment_image.shape[2] == 4:
-        garment_alpha_norm = garment_alpha.astype(float) / 255.0
-        garment_alpha_norm = np.expand_dims(garment_alpha_norm, axis=2)
-        alpha = alpha * garment_alpha_norm
-    
-    # Blend
-    result = (garment_bgr * alpha + result * (1 - alpha)).astype(np.uint8)
-    
-    return result
+    cv2.subtract(composite_mask, arms_mask, dst=composite_mask)
+    
+    # Opaque garment: the composite mask is binary, so a masked copy is exact
+    if garment_image.shape[2] != 4:
+        if out is not person_image:
+            np.copyto(out, person_image)
+        cv2.copyTo(garment_bgr, composite_mask, out)
+        return out
+
+    # Combine with garment alpha in uint8 fixed point (a * b / 255)
+    alpha = cv2.multiply(composite_mask, garment_alpha, scale=1 / 255.0)
+    alpha = cv2.merge([alpha, alpha, alpha])
+
+    # Blend: garment * alpha + person * (1 - alpha), all on uint8 buffers
+    foreground = cv2.multiply(garment_bgr, alpha, scale=1 / 255.0)
+    background = cv2.multiply(person_image, cv2.bitwise_not(alpha), scale=1 / 255.0)
+    cv2.add(foreground, background, dst=out)
+
+    return out
 
 
 def align_and_composite(
@@ -1,10 +1,14 @@
 """Stage 3: Garment preparation and anchor point detection."""
 import cv2
+import hashlib
+import threading
 import numpy as np
+from collections import OrderedDict
 from typing import Dict, Tuple, Optional
 
+from ..config import settings
 from ..models.job import ErrorCode
-from ..utils.image_utils import smooth_mask, remove_small_components, get_bounding_box
+from ..utils.image_utils import smooth_mask, remove_small_components, get_bounding_box, calculate_angle, distance
 
 
 class GarmentPrepError(Exception):
@@ -29,23 +33,35 @@ def remove_background(image: np.ndarray, threshold: int = 240) -> Tuple[np.ndarr
     # Convert to grayscale
     gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
     
-    # Threshold to find background (white/bright areas)
-    _, bg_mask = cv2.threshold(gray, threshold, 255, cv2.THRESH_BINARY)
-    
-    # Invert to get garment mask
-    garment_mask = cv2.bitwise_not(bg_mask)
+    # Garment is everything not brighter than the background threshold;
+    # the mask reuses the grayscale buffer
+    garment_mask = cv2.compare(gray, threshold, cv2.CMP_LE, dst=gray)
     
     # Clean up mask
     garment_mask = smooth_mask(garment_mask, kernel_size=3)
     garment_mask = remove_small_components(garment_mask, min_size=500)
     
-    # Create RGBA image
-    b, g, r = cv2.split(image)
-    rgba = cv2.merge([b, g, r, garment_mask])
+    # Create RGBA image by appending the mask as alpha in one pass
+    rgba = cv2.merge([image, garment_mask])
     
     return rgba, garment_mask
 
 
+def _masked_argmin(values: np.ndarray, mask: np.ndarray) -> Optional[int]:
+    """
+    Index of the smallest value where mask is set, in a single scan.
+    
+    Args:
+        values: 1-D integer array
+        mask: Boolean array of the same length
+        
+    Returns:
+        Index into values, or None if mask is empty
+    """
+    idx = int(np.argmin(np.where(mask, values, np.iinfo(np.int32).max)))
+    return idx if mask[idx] else None
+
+
 def detect_garment_anchor_points(
     garment_mask: np.ndarray,
     garment_type: Optional[str] = None
@@ -58,7 +74,8 @@ def detect_garment_anchor_points(
         garment_type: Type of garment (for type-specific detection)
         
     Returns:
-        Dictionary of anchor point names to coordinates
+        Dictionary of anchor point names to coordinates, plus precomputed
+        '_shoulder_width' and '_shoulder_angle' values
         
     Raises:
         GarmentPrepError: If anchor detection fails
@@ -70,62 +87,60 @@ def detect_garment_anchor_points(
     
     x, y, w, h = bbox
     
-    # Find contours
-    contours, _ = cv2.findContours(garment_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-    
-    if not contours:
-        raise GarmentPrepError("No garment contour found")
-    
-    # Get largest contour
-    contour = max(contours, key=cv2.contourArea)
+    # Edge profiles of the garment inside its bounding box: the first/last
+    # set row of every column and the first/last set column of every row.
+    # Anchors are boundary extremes, so no contour needs to be traced.
+    roi = garment_mask[y:y + h, x:x + w] > 0
+    cols_set = roi.any(axis=0)
+    rows_set = roi.any(axis=1)
+    top_row = np.argmax(roi, axis=0)
+    bottom_row = (h - 1) - np.argmax(roi[::-1, :], axis=0)
+    first_col = np.argmax(roi, axis=1)
+    last_col = (w - 1) - np.argmax(roi[:, ::-1], axis=1)
+    
+    cols = np.arange(w)
+    rows = np.arange(h)
+    center_dist = np.abs(cols - w // 2)
     
     # Detect key points based on garment geometry
     anchors = {}
     
-    # Top center (neckline) - highest point near center
-    top_points = contour[contour[:, 0, 1] < (y + h * 0.2)]
-    if len(top_points) > 0:
-        # Find point closest to horizontal center
-        center_x = x + w // 2
-        top_center_idx = np.argmin(np.abs(top_points[:, 0, 0] - center_x))
-        anchors['neckline'] = tuple(top_points[top_center_idx, 0])
+    # Top center (neckline) - top edge closest to the horizontal center
+    col = _masked_argmin(center_dist, cols_set & (top_row < h * 0.2))
+    if col is not None:
+        anchors['neckline'] = (x + col, y + int(top_row[col]))
     else:
         # Fallback
         anchors['neckline'] = (x + w // 2, y)
     
-    # Left shoulder - top left corner area
-    left_region = contour[
-        (contour[:, 0, 0] < (x + w * 0.4)) &
-        (contour[:, 0, 1] < (y + h * 0.3))
-    ]
-    if len(left_region) > 0:
-        # Leftmost point in top-left region
-        left_idx = np.argmin(left_region[:, 0, 0])
-        anchors['left_shoulder'] = tuple(left_region[left_idx, 0])
+    # Shoulders are searched in the top 30% of the garment
+    shoulder_rows = rows_set & (rows < h * 0.3)
+    
+    # Left shoulder - leftmost point in top-left region
+    row = _masked_argmin(first_col, shoulder_rows & (first_col < w * 0.4))
+    if row is not None:
+        anchors['left_shoulder'] = (x + int(first_col[row]), y + row)
     else:
         anchors['left_shoulder'] = (x, y + int(h * 0.15))
     
-    # Right shoulder - top right corner area
-    right_region = contour[
-        (contour[:, 0, 0] > (x + w * 0.6)) &
-        (contour[:, 0, 1] < (y + h * 0.3))
-    ]
-    if len(right_region) > 0:
-        # Rightmost point in top-right region
-        right_idx = np.argmax(right_region[:, 0, 0])
-        anchors['right_shoulder'] = tuple(right_region[right_idx, 0])
+    # Right shoulder - rightmost point in top-right region
+    row = _masked_argmin(-last_col, shoulder_rows & (last_col > w * 0.6))
+    if row is not None:
+        anchors['right_shoulder'] = (x + int(last_col[row]), y + row)
     else:
         anchors['right_shoulder'] = (x + w, y + int(h * 0.15))
     
-    # Bottom hem - lowest center point
-    bottom_points = contour[contour[:, 0, 1] > (y + h * 0.8)]
-    if len(bottom_points) > 0:
-        center_x = x + w // 2
-        bottom_center_idx = np.argmin(np.abs(bottom_points[:, 0, 0] - center_x))
-        anchors['hem_bottom'] = tuple(bottom_points[bottom_center_idx, 0])
+    # Bottom hem - bottom edge closest to the horizontal center
+    col = _masked_argmin(center_dist, cols_set & (bottom_row > h * 0.8))
+    if col is not None:
+        anchors['hem_bottom'] = (x + col, y + int(bottom_row[col]))
     else:
         anchors['hem_bottom'] = (x + w // 2, y + h)
     
+    # Shoulder geometry depends only on the garment; cache it for alignment
+    anchors['_shoulder_width'] = distance(anchors['left_shoulder'], anchors['right_shoulder'])
+    anchors['_shoulder_angle'] = calculate_angle(anchors['left_shoulder'], anchors['right_shoulder'])
+    
     return anchors
 
 
@@ -159,3 +174,56 @@ def prepare_garment(
         raise
     except Exception as e:
         raise GarmentPrepError(f"Garment preparation failed: {e}")
+
+
+# Prepared garments keyed by (image digest, shape, garment type), oldest first
+_prepared_cache: "OrderedDict[tuple, Tuple[np.ndarray, np.ndarray, Dict]]" = OrderedDict()
+_prepared_cache_lock = threading.Lock()
+
+
+def get_prepared_garment(
+    image: np.ndarray,
+    garment_type: Optional[str] = None
+) -> Tuple[np.ndarray, np.ndarray, Dict[str, Tuple[int, int]]]:
+    """
+    Prepare garment, reusing the result for an identical garment image.
+    
+    Retries and repeated try-ons of the same product skip background
+    removal and anchor detection. Cached arrays are shared between jobs
+    and therefore returned read-only. Safe to call from worker threads.
+    
+    Args:
+        image: Input garment image (BGR)
+        garment_type: Optional garment type
+        
+    Returns:
+        Tuple of (garment RGBA, garment mask, anchor points)
+        
+    Raises:
+        GarmentPrepError: If preparation fails
+    """
+    image = np.ascontiguousarray(image)
+    key = (
+        hashlib.blake2b(image.data, digest_size=16).digest(),
+        image.shape,
+        garment_type
+    )
+    
+    with _prepared_cache_lock:
+        cached = _prepared_cache.get(key)
+        if cached is not None:
+            _prepared_cache.move_to_end(key)
+            return cached
+    
+    garment_rgba, garment_mask, anchors = prepare_garment(image, garment_type)
+    garment_rgba.flags.writeable = False
+    garment_mask.flags.writeable = False
+    result = (garment_rgba, garment_mask, anchors)
+    
+    if settings.garment_cache_size > 0:
+        with _prepared_cache_lock:
+            _prepared_cache[key] = result
+            while len(_prepared_cache) > settings.garment_cache_size:
+                _prepared_cache.popitem(last=False)
+    
+    return result
@@ -0,0 +1,53 @@
+"""Shared HTTP client for outbound requests (image downloads, Nano Banana API)."""
+import httpx
+from typing import Optional
+
+
+# Connection pool limits for the shared client
+MAX_CONNECTIONS = 32
+MAX_KEEPALIVE_CONNECTIONS = 16
+
+# Retries of failed connection attempts, handled by the transport
+CONNECT_RETRIES = 3
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def get_client() -> httpx.AsyncClient:
+    """
+    Get the process-wide AsyncClient, creating it on first use.
+
+    Reusing one client keeps connections (and TLS sessions) pooled across
+    requests instead of paying a new handshake per call. Callers pass
+    their own per-request timeout.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    global _client
+
+    if _client is None or _client.is_closed:
+        # Limits go on the transport: a client given a transport ignores its own.
+        # HTTP/2 is negotiated via ALPN, so concurrent API calls share one
+        # connection; hosts without it fall back to HTTP/1.1.
+        _client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=CONNECT_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS
+                )
+            )
+        )
+
+    return _client
+
+
+async def close_client():
+    """Close the shared client (called on application shutdown)."""
+    global _client
+
+    if _client is not None:
+        await _client.aclose()
+        _client = None
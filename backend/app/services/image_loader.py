@@ -1,15 +1,30 @@
 """Stage 0: Image loading and normalization."""
+import asyncio
+import math
+import os
 import httpx
 import cv2
 import numpy as np
 from PIL import Image
-from pathlib import Path
-from typing import Tuple, Optional
+from io import BytesIO
+from typing import Optional, Union
 
 from ..config import settings
 from ..models.job import ErrorCode
+from .http_client import get_client
 from ..utils.image_utils import auto_rotate_image, resize_maintain_aspect, pil_to_cv2
-from ..utils.validation import validate_image_format, validate_image_size
+from ..utils.validation import validate_image_signature
+
+
+# Read size for streamed downloads
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# JPEG DCT-domain downscale factors and their decode flags, largest first
+_REDUCED_DECODE_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2),
+)
 
 
 class ImageLoadError(Exception):
@@ -22,7 +37,7 @@ class ImageLoadError(Exception):
 
 async def download_image(url: str, timeout: int = 30) -> bytes:
     """
-    Download image from URL.
+    Download image from URL, streaming the body up to the size limit.
     
     Args:
         url: Image URL
@@ -32,20 +47,39 @@ async def download_image(url: str, timeout: int = 30) -> bytes:
         Image bytes
         
     Raises:
-        ImageLoadError: If download fails
+        ImageLoadError: If download fails or the image exceeds max_image_size_mb
     """
+    max_bytes = settings.max_image_size_mb * 1024 * 1024
+    too_large = ImageLoadError(
+        f"Image too large. Maximum: {settings.max_image_size_mb}MB",
+        ErrorCode.IMAGE_TOO_LARGE
+    )
+    
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(url, timeout=timeout)
+        client = get_client()
+        async with client.stream("GET", url, timeout=timeout) as response:
             response.raise_for_status()
-            return response.content
+            
+            # Reject up front when the server announces an oversized body
+            content_length = response.headers.get("content-length")
+            if content_length and content_length.isdigit() and int(content_length) > max_bytes:
+                raise too_large
+            
+            # Stop reading as soon as the limit is crossed
+            data = bytearray()
+            async for chunk in response.aiter_bytes(DOWNLOAD_CHUNK_SIZE):
+                data += chunk
+                if len(data) > max_bytes:
+                    raise too_large
+            
+            return bytes(data)
     except httpx.TimeoutException:
         raise ImageLoadError("Image download timed out", ErrorCode.TIMEOUT)
     except httpx.HTTPError as e:
         raise ImageLoadError(f"Failed to download image: {e}", ErrorCode.STORAGE_ERROR)
 
 
-def load_image_from_path(image_path: str) -> Image.Image:
+def load_image_from_path(image_path: str) -> np.ndarray:
     """
     Load image from file path.
     
@@ -53,36 +87,87 @@ def load_image_from_path(image_path: str) -> Image.Image:
         image_path: Path to image file
         
     Returns:
-        PIL Image
+        Decoded image (BGR), possibly reduced but not below the working size
         
     Raises:
         ImageLoadError: If loading fails
     """
-    path = Path(image_path)
-    
-    if not path.exists():
+    # One open: size from the open handle, then a single read
+    try:
+        with open(image_path, 'rb') as f:
+            if os.fstat(f.fileno()).st_size > settings.max_image_size_mb * 1024 * 1024:
+                raise ImageLoadError(
+                    f"Image too large. Maximum: {settings.max_image_size_mb}MB",
+                    ErrorCode.IMAGE_TOO_LARGE
+                )
+            data = f.read()
+    except FileNotFoundError:
         raise ImageLoadError(f"Image not found: {image_path}", ErrorCode.STORAGE_ERROR)
+    except OSError as e:
+        # Directories, permission errors and other unreadable paths
+        raise ImageLoadError(f"Failed to read image {image_path}: {e}", ErrorCode.STORAGE_ERROR)
     
-    if not validate_image_format(path):
+    # Validate by content signature rather than file suffix
+    if not validate_image_signature(data):
         raise ImageLoadError(
             f"Invalid image format. Allowed: {', '.join(['.jpg', '.png'])}",
             ErrorCode.INVALID_IMAGE_FORMAT
         )
     
-    if not validate_image_size(path, settings.max_image_size_mb):
-        raise ImageLoadError(
-            f"Image too large. Maximum: {settings.max_image_size_mb}MB",
-            ErrorCode.IMAGE_TOO_LARGE
-        )
+    # Same decoder as URL loads: straight to BGR, reduced where possible
+    return decode_to_bgr(data, settings.work_image_size)
+
+
+def decode_to_bgr(image_bytes: bytes, max_size: Optional[int] = None) -> np.ndarray:
+    """
+    Decode encoded image bytes straight to a BGR array with OpenCV.
     
-    try:
-        image = Image.open(path)
-        return image
-    except Exception as e:
-        raise ImageLoadError(f"Failed to load image: {e}", ErrorCode.INVALID_IMAGE_FORMAT)
+    OpenCV applies the EXIF orientation itself (all eight cases). When
+    max_size is given, large JPEGs are decoded at 1/2, 1/4 or 1/8 scale,
+    never below max_size on the long edge.
+    
+    Args:
+        image_bytes: Encoded image bytes
+        max_size: Optional target long edge the image will be resized to
+        
+    Returns:
+        Decoded image (BGR)
+        
+    Raises:
+        ImageLoadError: If the bytes cannot be decoded
+    """
+    flags = cv2.IMREAD_COLOR
+    
+    if max_size:
+        try:
+            # Header only; no pixel data is decoded here
+            with Image.open(BytesIO(image_bytes)) as probe:
+                fmt = probe.format
+                w, h = probe.size
+        except Exception as e:
+            raise ImageLoadError(f"Failed to load image: {e}", ErrorCode.INVALID_IMAGE_FORMAT)
+        
+        if fmt == 'JPEG':
+            scale = max_size / max(w, h)
+            need_w, need_h = math.ceil(w * scale), math.ceil(h * scale)
+            for factor, reduced_flag in _REDUCED_DECODE_FLAGS:
+                if w // factor >= need_w and h // factor >= need_h:
+                    flags = reduced_flag
+                    break
+    
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), flags)
+    
+    if image is None:
+        # Fall back to PIL for anything OpenCV cannot decode
+        try:
+            image = pil_to_cv2(auto_rotate_image(Image.open(BytesIO(image_bytes))).convert('RGB'))
+        except Exception as e:
+            raise ImageLoadError(f"Failed to load image: {e}", ErrorCode.INVALID_IMAGE_FORMAT)
+    
+    return image
 
 
-async def load_image_from_url(url: str) -> Image.Image:
+async def load_image_from_url(url: str) -> np.ndarray:
     """
     Load image from URL.
     
@@ -90,44 +175,40 @@ async def load_image_from_url(url: str) -> Image.Image:
         url: Image URL
         
     Returns:
-        PIL Image
+        Decoded image (BGR), possibly reduced but not below the working size
         
     Raises:
         ImageLoadError: If loading fails
     """
     try:
+        # Size limit is enforced while downloading
         image_bytes = await download_image(url)
         
-        # Check size
-        size_mb = len(image_bytes) / (1024 * 1024)
-        if size_mb > settings.max_image_size_mb:
-            raise ImageLoadError(
-                f"Image too large. Maximum: {settings.max_image_size_mb}MB",
-                ErrorCode.IMAGE_TOO_LARGE
-            )
-        
-        # Load image
-        from io import BytesIO
-        image = Image.open(BytesIO(image_bytes))
-        
-        return image
+        # Decoding is CPU-bound; keep it off the event loop
+        return await asyncio.to_thread(decode_to_bgr, image_bytes, settings.work_image_size)
         
     except ImageLoadError:
         raise
     except Exception as e:
-        raise ImageLoadError(f"Failed to load image: {e}", ErrorCode.INVALID_IMAGE_FORMAT)
+        # e.g. httpx.InvalidURL or a ValueError from URL construction
+        raise ImageLoadError(f"Failed to load image from URL: {e}", ErrorCode.STORAGE_ERROR)
 
 
-def normalize_image(image: Image.Image) -> np.ndarray:
+def normalize_image(image: Union[Image.Image, np.ndarray]) -> np.ndarray:
     """
     Normalize image: auto-rotate, resize, convert to RGB, return as OpenCV array.
     
     Args:
-        image: PIL Image
+        image: PIL Image, or an already decoded and oriented BGR array
         
     Returns:
         Normalized image as numpy array (BGR format)
     """
+    # Loaders decode straight to BGR (reduced where possible, see
+    # decode_to_bgr), so arrays only need the final resize
+    if isinstance(image, np.ndarray):
+        return resize_maintain_aspect(image, settings.work_image_size)
+    
     # Auto-rotate based on EXIF
     image = auto_rotate_image(image)
     
@@ -147,7 +228,7 @@ def normalize_image(image: Image.Image) -> np.ndarray:
 async def load_and_normalize(
     image_url: Optional[str] = None,
     image_path: Optional[str] = None
-) -> Tuple[np.ndarray, Image.Image]:
+) -> np.ndarray:
     """
     Load and normalize image from URL or path.
     
@@ -156,20 +237,18 @@ async def load_and_normalize(
         image_path: Optional image path
         
     Returns:
-        Tuple of (normalized OpenCV image, original PIL image)
+        Normalized OpenCV image (BGR)
         
     Raises:
         ImageLoadError: If loading or normalization fails
     """
     # Load image
     if image_url:
-        pil_image = await load_image_from_url(image_url)
+        image = await load_image_from_url(image_url)
     elif image_path:
-        pil_image = load_image_from_path(image_path)
+        image = await asyncio.to_thread(load_image_from_path, image_path)
     else:
         raise ImageLoadError("No image URL or path provided", ErrorCode.STORAGE_ERROR)
     
-    # Normalize
-    normalized = normalize_image(pil_image)
-    
-    return normalized, pil_image
+    # Normalize (decode/rotate/resize release the GIL, so run in a worker thread)
+    return await asyncio.to_thread(normalize_image, image)
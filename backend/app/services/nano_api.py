@@ -1,14 +1,22 @@
 """Stage 6: Nano Banana API integration."""
+import asyncio
 import httpx
 import cv2
 import numpy as np
+from functools import lru_cache
 from typing import Dict, Optional
 import base64
-from io import BytesIO
-from PIL import Image
 
 from ..config import settings
 from ..models.job import ErrorCode
+from .http_client import get_client
+
+
+# Attempts per API call for transient failures, and the first backoff delay
+NANO_API_ATTEMPTS = 3
+NANO_API_BACKOFF_SECONDS = 1.0
+
+NEGATIVE_PROMPT = "deformed, distorted, disfigured, bad anatomy, wrong proportions, blurry, low quality"
 
 
 class NanoAPIError(Exception):
@@ -27,23 +35,38 @@ def numpy_to_base64(image: np.ndarray) -> str:
         image: Image as numpy array (BGR)
         
     Returns:
-        Base64 encoded string
+        Base64 encoded JPEG string
     """
-    # Convert BGR to RGB
-    rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    pil_image = Image.fromarray(rgb)
-    
-    # Encode to JPEG
-    buffer = BytesIO()
-    pil_image.save(buffer, format='JPEG', quality=95)
-    buffer.seek(0)
+    return base64.b64encode(numpy_to_jpeg(image)).decode('ascii')
+
+
+def numpy_to_jpeg(image: np.ndarray, quality: int = 95) -> bytes:
+    """
+    Encode numpy array to raw JPEG bytes.
     
-    # Base64 encode
-    encoded = base64.b64encode(buffer.read()).decode('utf-8')
+    Args:
+        image: Image as numpy array (BGR)
+        quality: JPEG quality 0-100
+        
+    Returns:
+        JPEG encoded bytes
+        
+    Raises:
+        NanoAPIError: If encoding fails
+    """
+    # OpenCV encodes BGR directly, so no RGB copy or PIL image is needed
+    ok, buffer = cv2.imencode(
+        '.jpg',
+        image,
+        [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1]
+    )
+    if not ok:
+        raise NanoAPIError("Failed to encode image")
     
-    return encoded
+    return buffer.tobytes()
 
 
+@lru_cache(maxsize=128)
 def create_prompt(
     preserve_face: bool = True,
     preserve_background: bool = True,
@@ -60,7 +83,7 @@ def create_prompt(
         garment_type: Type of garment
         
     Returns:
-        Prompt string
+        Prompt string (cached per argument combination; the function is pure)
     """
     prompt_parts = []
     
@@ -111,6 +134,52 @@ def create_prompt(
     return " ".join(prompt_parts)
 
 
+async def _post_with_retries(
+    url: str,
+    headers: Dict[str, str],
+    timeout: int,
+    request_kwargs: Dict
+) -> httpx.Response:
+    """
+    POST to the API, retrying transient failures with exponential backoff.
+    
+    Transport errors, timeouts and 5xx responses are retried; 4xx responses
+    fail immediately since repeating the request cannot fix them.
+    
+    Args:
+        url: Request URL
+        headers: Request headers
+        timeout: Request timeout in seconds
+        request_kwargs: Body arguments for client.post (json, or files/data)
+        
+    Returns:
+        Successful response
+        
+    Raises:
+        httpx.HTTPError: If the last attempt fails or a 4xx is returned
+    """
+    client = get_client()
+    
+    for attempt in range(NANO_API_ATTEMPTS):
+        last_attempt = attempt == NANO_API_ATTEMPTS - 1
+        
+        try:
+            response = await client.post(url, headers=headers, timeout=timeout, **request_kwargs)
+        except httpx.TransportError as e:
+            if last_attempt:
+                raise
+            reason = type(e).__name__
+        else:
+            if response.status_code < 500 or last_attempt:
+                response.raise_for_status()
+                return response
+            reason = f"HTTP {response.status_code}"
+        
+        delay = NANO_API_BACKOFF_SECONDS * 2 ** attempt
+        print(f"  Nano Banana request failed ({reason}), retrying in {delay:.0f}s...")
+        await asyncio.sleep(delay)
+
+
 async def call_nano_banana_api(
     person_image: np.ndarray,
     garment_image: np.ndarray,
@@ -138,36 +207,58 @@ async def call_nano_banana_api(
         timeout = settings.nano_banana_timeout
     
     try:
-        # Encode images to base64
-        person_b64 = numpy_to_base64(person_image)
-        garment_b64 = numpy_to_base64(garment_image)
-        draft_b64 = numpy_to_base64(draft_composite)
-        
-        # Prepare request payload
-        payload = {
-            "person_image": person_b64,
-            "garment_image": garment_b64,
-            "draft_image": draft_b64,
-            "prompt": prompt,
-            "negative_prompt": "deformed, distorted, disfigured, bad anatomy, wrong proportions, blurry, low quality",
-        }
+        multipart = settings.nano_banana_request_format == "multipart"
+        encode = numpy_to_jpeg if multipart else numpy_to_base64
+        
+        # Encode the three images concurrently; OpenCV releases the GIL while
+        # compressing, and the event loop stays free meanwhile
+        person_data, garment_data, draft_data = await asyncio.gather(
+            asyncio.to_thread(encode, person_image),
+            asyncio.to_thread(encode, garment_image),
+            asyncio.to_thread(encode, draft_composite)
+        )
         
-        # Make API request
+        if multipart:
+            # Send raw JPEG parts and form fields; no base64 or JSON string building
+            request_kwargs = {
+                "files": {
+                    "person_image": ("person.jpg", person_data, "image/jpeg"),
+                    "garment_image": ("garment.jpg", garment_data, "image/jpeg"),
+                    "draft_image": ("draft.jpg", draft_data, "image/jpeg"),
+                },
+                "data": {
+                    "prompt": prompt,
+                    "negative_prompt": NEGATIVE_PROMPT,
+                },
+            }
+        else:
+            request_kwargs = {
+                "json": {
+                    "person_image": person_data,
+                    "garment_image": garment_data,
+                    "draft_image": draft_data,
+                    "prompt": prompt,
+                    "negative_prompt": NEGATIVE_PROMPT,
+                },
+            }
+        
+        # Make API request (httpx sets the JSON or multipart Content-Type)
         headers = {
             "Authorization": f"Bearer {settings.nano_banana_api_key}",
-            "Content-Type": "application/json"
+            "Accept": "image/jpeg, image/png, application/json"
         }
         
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                settings.nano_banana_api_url,
-                json=payload,
-                headers=headers,
-                timeout=timeout
-            )
-            
-            response.raise_for_status()
-            
+        response = await _post_with_retries(
+            settings.nano_banana_api_url,
+            headers,
+            timeout,
+            request_kwargs
+        )
+        
+        if response.headers.get("content-type", "").startswith("image/"):
+            # Binary response: the body already is the encoded image
+            image_bytes = response.content
+        else:
             result_data = response.json()
             
             # Extract result image from response
@@ -175,18 +266,16 @@ async def call_nano_banana_api(
             if 'image' not in result_data:
                 raise NanoAPIError(f"Invalid API response: {result_data}")
             
-            result_b64 = result_data['image']
-            
-            # Decode base64 to image
-            image_bytes = base64.b64decode(result_b64)
-            nparr = np.frombuffer(image_bytes, np.uint8)
-            result_image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
-            
-            if result_image is None:
-                raise NanoAPIError("Failed to decode result image")
-            
-            return result_image
-            
+            image_bytes = base64.b64decode(result_data['image'])
+        
+        # Decode straight from a view over the bytes
+        result_image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+        
+        if result_image is None:
+            raise NanoAPIError("Failed to decode result image")
+        
+        return result_image
+        
     except httpx.TimeoutException:
         raise NanoAPIError("API request timed out", ErrorCode.TIMEOUT)
     except httpx.HTTPError as e:
@@ -1,9 +1,13 @@
 """Stage 2: Pose detection and keypoint extraction."""
 import cv2
+import threading
 import numpy as np
+from dataclasses import dataclass
+from functools import lru_cache
 from typing import Dict, Tuple, Optional
 import mediapipe as mp
 
+from ..config import settings
 from ..models.job import ErrorCode
 from ..utils.image_utils import get_bounding_box
 
@@ -19,8 +23,73 @@ class PoseDetectionError(Exception):
 # Initialize MediaPipe Pose
 mp_pose = mp.solutions.pose
 
+# Keypoint rows of Keypoints.xy; all but the derived neck map to MediaPipe landmarks
+KEYPOINT_NAMES = (
+    'nose',
+    'left_shoulder',
+    'right_shoulder',
+    'left_elbow',
+    'right_elbow',
+    'left_wrist',
+    'right_wrist',
+    'left_hip',
+    'right_hip',
+    'neck',
+)
+LEFT_SHOULDER = KEYPOINT_NAMES.index('left_shoulder')
+RIGHT_SHOULDER = KEYPOINT_NAMES.index('right_shoulder')
+NECK = KEYPOINT_NAMES.index('neck')
+_LANDMARK_IDS = [mp_pose.PoseLandmark[name.upper()].value for name in KEYPOINT_NAMES[:NECK]]
 
-def detect_keypoints(image: np.ndarray, confidence_threshold: float = 0.5) -> Dict[str, Tuple[int, int]]:
+
+@dataclass
+class Keypoints:
+    """Keypoints as arrays indexed by KEYPOINT_NAMES order."""
+    xy: np.ndarray       # (N, 2) int32 pixel coordinates
+    visible: np.ndarray  # (N,) bool, False where the keypoint was not detected
+    
+    def to_dict(self) -> Dict[str, Tuple[int, int]]:
+        """Convert to the name -> (x, y) mapping used by the pipeline stages."""
+        return {
+            name: (x, y)
+            for name, (x, y), ok in zip(KEYPOINT_NAMES, self.xy.tolist(), self.visible)
+            if ok
+        }
+
+
+# MediaPipe graphs are not thread-safe; the shared instances are used under this lock
+_pose_lock = threading.Lock()
+
+# Per-thread RGB input buffer, reused across calls with the same image shape
+_buffers = threading.local()
+
+
+def _rgb_buffer(shape: Tuple[int, ...]) -> np.ndarray:
+    """Get this thread's reusable RGB buffer for the given shape."""
+    buf = getattr(_buffers, 'rgb', None)
+    if buf is None or buf.shape != shape:
+        buf = np.empty(shape, dtype=np.uint8)
+        _buffers.rgb = buf
+    return buf
+
+
+@lru_cache(maxsize=4)
+def _get_pose(min_detection_confidence: float):
+    """
+    Get a reusable MediaPipe Pose graph for the given detection confidence.
+    
+    Building the graph loads the model and dominates the per-image cost, so
+    it is built once and kept. static_image_mode means no tracking state is
+    carried between images.
+    """
+    return mp_pose.Pose(
+        static_image_mode=True,
+        model_complexity=settings.pose_model_complexity,
+        min_detection_confidence=min_detection_confidence
+    )
+
+
+def detect_keypoint_array(image: np.ndarray, confidence_threshold: float = 0.5) -> Keypoints:
     """
     Detect body keypoints using MediaPipe Pose.
     
@@ -29,7 +98,7 @@ def detect_keypoints(image: np.ndarray, confidence_threshold: float = 0.5) -> Di
         confidence_threshold: Minimum confidence for keypoint detection
         
     Returns:
-        Dictionary of keypoint names to (x, y) coordinates
+        Keypoints arrays
         
     Raises:
         PoseDetectionError: If pose detection fails
@@ -37,70 +106,45 @@ def detect_keypoints(image: np.ndarray, confidence_threshold: float = 0.5) -> Di
     try:
         h, w = image.shape[:2]
         
+        # Pose models work at low resolution; landmarks come back normalized,
+        # so downscaling only changes inference cost, not the coordinate mapping
+        scale = settings.pose_input_size / max(h, w)
+        if scale < 1:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        
         # Convert to RGB for MediaPipe
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=_rgb_buffer(image.shape))
         
         # Run pose detection
-        with mp_pose.Pose(
-            static_image_mode=True,
-            model_complexity=2,
-            min_detection_confidence=confidence_threshold
-        ) as pose:
-            results = pose.process(rgb_image)
+        with _pose_lock:
+            results = _get_pose(confidence_threshold).process(rgb_image)
         
         if not results.pose_landmarks:
             raise PoseDetectionError("No pose detected in image")
         
         landmarks = results.pose_landmarks.landmark
         
-        # Extract key points we need
-        keypoints = {}
-        
-        # MediaPipe landmark indices
-        landmark_map = {
-            'nose': mp_pose.PoseLandmark.NOSE,
-            'left_shoulder': mp_pose.PoseLandmark.LEFT_SHOULDER,
-            'right_shoulder': mp_pose.PoseLandmark.RIGHT_SHOULDER,
-            'left_elbow': mp_pose.PoseLandmark.LEFT_ELBOW,
-            'right_elbow': mp_pose.PoseLandmark.RIGHT_ELBOW,
-            'left_wrist': mp_pose.PoseLandmark.LEFT_WRIST,
-            'right_wrist': mp_pose.PoseLandmark.RIGHT_WRIST,
-            'left_hip': mp_pose.PoseLandmark.LEFT_HIP,
-            'right_hip': mp_pose.PoseLandmark.RIGHT_HIP,
-        }
+        # Gather (x, y, visibility) of the landmarks we use into one array;
+        # the last row is left for the derived neck point
+        lm = np.zeros((len(KEYPOINT_NAMES), 3), dtype=np.float64)
+        lm[:NECK] = [(landmarks[i].x, landmarks[i].y, landmarks[i].visibility) for i in _LANDMARK_IDS]
         
-        for name, landmark_id in landmark_map.items():
-            landmark = landmarks[landmark_id.value]
-            
-            # Check confidence (visibility)
-            if landmark.visibility < confidence_threshold:
-                continue
-            
-            # Convert normalized coordinates to pixel coordinates
-            x = int(landmark.x * w)
-            y = int(landmark.y * h)
-            
-            # Ensure within bounds
-            x = max(0, min(w - 1, x))
-            y = max(0, min(h - 1, y))
-            
-            keypoints[name] = (x, y)
+        # Convert normalized coordinates to pixel coordinates within bounds
+        xy = (lm[:, :2] * (w, h)).astype(np.int32)
+        np.clip(xy, 0, (w - 1, h - 1), out=xy)
         
-        # Calculate neck point (midpoint between shoulders)
-        if 'left_shoulder' in keypoints and 'right_shoulder' in keypoints:
-            ls = keypoints['left_shoulder']
-            rs = keypoints['right_shoulder']
-            keypoints['neck'] = (
-                (ls[0] + rs[0]) // 2,
-                (ls[1] + rs[1]) // 2
-            )
+        # Keep keypoints whose confidence (visibility) passes the threshold
+        visible = lm[:, 2] >= confidence_threshold
         
         # Validate we have minimum required keypoints
-        required = ['left_shoulder', 'right_shoulder']
-        if not all(k in keypoints for k in required):
+        if not (visible[LEFT_SHOULDER] and visible[RIGHT_SHOULDER]):
             raise PoseDetectionError("Missing critical keypoints (shoulders)")
         
-        return keypoints
+        # Calculate neck point (midpoint between shoulders)
+        xy[NECK] = (xy[LEFT_SHOULDER] + xy[RIGHT_SHOULDER]) // 2
+        visible[NECK] = True
+        
+        return Keypoints(xy=xy, visible=visible)
         
     except PoseDetectionError:
         raise
@@ -108,6 +152,23 @@ def detect_keypoints(image: np.ndarray, confidence_threshold: float = 0.5) -> Di
         raise PoseDetectionError(f"Pose detection failed: {e}")
 
 
+def detect_keypoints(image: np.ndarray, confidence_threshold: float = 0.5) -> Dict[str, Tuple[int, int]]:
+    """
+    Detect body keypoints using MediaPipe Pose.
+    
+    Args:
+        image: Input image (BGR)
+        confidence_threshold: Minimum confidence for keypoint detection
+        
+    Returns:
+        Dictionary of keypoint names to (x, y) coordinates
+        
+    Raises:
+        PoseDetectionError: If pose detection fails
+    """
+    return detect_keypoint_array(image, confidence_threshold).to_dict()
+
+
 def get_fallback_keypoints(person_mask: np.ndarray) -> Dict[str, Tuple[int, int]]:
     """
     Generate fallback keypoints from person mask bounding box.
@@ -1,13 +1,22 @@
 """Stage 5: Quality control and validation."""
 import cv2
 import numpy as np
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Optional
 
 from ..config import settings
 from ..models.job import ErrorCode
 from ..utils.image_utils import distance
 
 
+# Weights of the individual checks in the overall quality score
+QUALITY_WEIGHTS = {
+    'neckline_alignment': 0.3,
+    'shoulder_angle': 0.2,
+    'overlap': 0.3,
+    'scale': 0.2
+}
+
+
 class QualityCheckError(Exception):
     """Error during quality check."""
     def __init__(self, message: str, error_code: ErrorCode = ErrorCode.QUALITY_CHECK_FAILED):
@@ -105,14 +114,19 @@ def check_garment_within_person(
     Returns:
         Tuple of (passed, overlap_score)
     """
+    # The bounding box is the only full-frame pass: every garment pixel lies
+    # inside it, so both counts below only touch that region
+    x, y, w, h = cv2.boundingRect(garment_mask)
+    garment_roi = garment_mask[y:y + h, x:x + w]
+    
     # Count garment pixels
-    garment_pixels = cv2.countNonZero(garment_mask)
+    garment_pixels = cv2.countNonZero(garment_roi) if w > 0 else 0
     
     if garment_pixels == 0:
         return False, 0.0
     
     # Count garment pixels inside person
-    overlap = cv2.bitwise_and(garment_mask, person_mask)
+    overlap = cv2.bitwise_and(garment_roi, person_mask[y:y + h, x:x + w])
     overlap_pixels = cv2.countNonZero(overlap)
     
     # Calculate overlap ratio
@@ -166,7 +180,8 @@ def calculate_quality_score(
     person_keypoints: Dict[str, Tuple[int, int]],
     garment_mask: np.ndarray,
     person_mask: np.ndarray,
-    transform_params: Dict[str, float]
+    transform_params: Dict[str, float],
+    fail_fast: Optional[bool] = None
 ) -> Tuple[float, Dict[str, float], bool]:
     """
     Calculate overall quality score for try-on result.
@@ -177,10 +192,15 @@ def calculate_quality_score(
         garment_mask: Transformed garment mask
         person_mask: Person mask
         transform_params: Applied transformation
+        fail_fast: Skip the mask overlap check once a geometric check has
+            failed (uses config default if None); skipped checks score 0
         
     Returns:
         Tuple of (overall_score, individual_scores, passed)
     """
+    if fail_fast is None:
+        fail_fast = settings.quality_fail_fast
+    
     scores = {}
     checks = {}
     
@@ -194,25 +214,23 @@ def calculate_quality_score(
     scores['shoulder_angle'] = score
     checks['shoulder_angle'] = passed
     
-    # Garment within person
-    passed, score = check_garment_within_person(garment_mask, person_mask)
-    scores['overlap'] = score
-    checks['overlap'] = passed
-    
     # Scale reasonableness
     passed, score = check_scale_reasonable(transform_params)
     scores['scale'] = score
     checks['scale'] = passed
     
+    # The geometric checks above are O(1); the mask check below scans pixels
+    if fail_fast and not all(checks.values()):
+        overall_score = sum(scores.get(k, 0.0) * weight for k, weight in QUALITY_WEIGHTS.items())
+        return overall_score, scores, False
+    
+    # Garment within person
+    passed, score = check_garment_within_person(garment_mask, person_mask)
+    scores['overlap'] = score
+    checks['overlap'] = passed
+    
     # Overall score (weighted average)
-    weights = {
-        'neckline_alignment': 0.3,
-        'shoulder_angle': 0.2,
-        'overlap': 0.3,
-        'scale': 0.2
-    }
-    
-    overall_score = sum(scores[k] * weights[k] for k in weights.keys())
+    overall_score = sum(scores[k] * weight for k, weight in QUALITY_WEIGHTS.items())
     
     # Overall pass/fail
     all_passed = all(checks.values())
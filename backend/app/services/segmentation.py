@@ -1,11 +1,15 @@
 """Stage 1: Person segmentation and silhouette extraction."""
 import cv2
+import threading
 import numpy as np
+from functools import lru_cache
 from typing import Dict, Tuple
-from rembg import remove
+from PIL import Image
+from rembg import new_session, remove
 
+from ..config import settings
 from ..models.job import ErrorCode
-from ..utils.image_utils import smooth_mask, remove_small_components
+from ..utils.image_utils import smooth_mask, remove_small_components, get_bounding_box
 
 
 class SegmentationError(Exception):
@@ -16,6 +20,26 @@ class SegmentationError(Exception):
         super().__init__(message)
 
 
+# Guards the one-time session load when several workers start at once
+_session_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _load_session():
+    return new_session(settings.segmentation_model)
+
+
+def get_session():
+    """
+    Get the shared rembg session, loading the model on first use.
+    
+    Without a session rembg reloads the ONNX model on every call. ONNX
+    Runtime picks the best available execution provider (CUDA if present).
+    """
+    with _session_lock:
+        return _load_session()
+
+
 def extract_person_mask(image: np.ndarray) -> np.ndarray:
     """
     Extract person segmentation mask using rembg.
@@ -30,18 +54,44 @@ def extract_person_mask(image: np.ndarray) -> np.ndarray:
         SegmentationError: If segmentation fails
     """
     try:
-        # Convert to RGB for rembg
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+        # The segmentation network runs at ~320px regardless of input size,
+        # so segment a downscaled copy and upsample its alpha, as rembg
+        # itself would have done for a full-resolution input
+        h, w = image.shape[:2]
+        scale = settings.segmentation_input_size / max(h, w)
+        if scale < 1:
+            image = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        else:
+            scale = 1.0
+        
+        # rembg works on PIL images and would copy an ndarray into one anyway;
+        # reading the BGR buffer with PIL's BGR unpacker does the channel
+        # swap during that copy instead of in a separate cvtColor pass
+        small_h, small_w = image.shape[:2]
+        pil_image = Image.frombuffer(
+            'RGB', (small_w, small_h), np.ascontiguousarray(image), 'raw', 'BGR', 0, 1
+        )
         
-        # Remove background - returns RGBA
-        result = remove(rgb_image, alpha_matting=True, alpha_matting_erode_size=10)
+        # Remove background - returns RGBA. The mask is thresholded and
+        # smoothed below, so alpha matting's soft edges are off by default.
+        result = remove(
+            pil_image,
+            session=get_session(),
+            alpha_matting=settings.segmentation_alpha_matting,
+            alpha_matting_erode_size=10
+        )
         
-        # Extract alpha channel as mask
-        if result.shape[2] == 4:
-            mask = result[:, :, 3]
+        # Extract alpha channel as mask (only that plane is converted)
+        if result.mode == 'RGBA':
+            mask = np.asarray(result.getchannel('A'))
         else:
             raise SegmentationError("Failed to extract alpha channel")
         
+        # Back to full resolution before thresholding, so the cleanup
+        # below runs with its full-resolution kernel and component sizes
+        if scale < 1:
+            mask = cv2.resize(mask, (w, h), interpolation=cv2.INTER_LINEAR)
+        
         # Threshold to binary
         _, binary_mask = cv2.threshold(mask, 127, 255, cv2.THRESH_BINARY)
         
@@ -93,14 +143,20 @@ def extract_torso_mask(person_mask: np.ndarray, keypoints: Dict) -> np.ndarray:
             
             cv2.fillPoly(torso_mask, [points], 255)
             
-            # Intersect with person mask
-            torso_mask = cv2.bitwise_and(torso_mask, person_mask)
+            # Intersect with person mask. Outside the polygon's bounding box
+            # the torso mask is still zero, so only that region is ANDed.
+            x, y, box_w, box_h = cv2.boundingRect(points)
+            x0, y0 = max(x, 0), max(y, 0)
+            x1, y1 = min(x + box_w, w), min(y + box_h, h)
+            if x1 > x0 and y1 > y0:
+                roi = torso_mask[y0:y1, x0:x1]
+                cv2.bitwise_and(roi, person_mask[y0:y1, x0:x1], dst=roi)
         else:
             # Fallback: use upper 70% of person mask
             # Find bounding box of person
-            contours, _ = cv2.findContours(person_mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
-            if contours:
-                x, y, box_w, box_h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+            bbox = get_bounding_box(person_mask)
+            if bbox is not None:
+                x, y, box_w, box_h = bbox
                 
                 # Take upper 70%
                 torso_h = int(box_h * 0.7)
@@ -130,15 +186,14 @@ def extract_arms_mask(
         Arms mask
     """
     try:
-        # Simple approach: arms = person - torso (in upper body region)
-        arms_mask = cv2.bitwise_and(
-            person_mask,
-            cv2.bitwise_not(torso_mask)
-        )
-        
-        # Only keep upper half (arms, not legs)
-        h = person_mask.shape[0]
-        arms_mask[h//2:, :] = 0
+        # Simple approach: arms = person - torso (in upper body region).
+        # Only the upper half is kept (arms, not legs), so only it is
+        # computed, in place in the output rows. Both masks are binary
+        # (0/255), so a saturating subtract is person AND NOT torso in a
+        # single pass.
+        arms_mask = np.zeros_like(person_mask)
+        h = person_mask.shape[0] // 2
+        cv2.subtract(person_mask[:h], torso_mask[:h], dst=arms_mask[:h])
         
         return arms_mask
         
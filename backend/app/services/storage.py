@@ -1,14 +1,20 @@
 """Stage 7: Result storage and artifact management."""
 import cv2
+import os
 import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Optional
-import json
+from typing import Callable, Dict, Optional
 
 from ..config import settings
 from ..models.job import ErrorCode
 
 
+# Background writers for debug artifacts, off the job's critical path
+_IO_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="artifact-io")
+
+
 class StorageError(Exception):
     """Error during storage operations."""
     def __init__(self, message: str, error_code: ErrorCode = ErrorCode.STORAGE_ERROR):
@@ -17,13 +23,14 @@ class StorageError(Exception):
         super().__init__(message)
 
 
-def save_image(image: np.ndarray, file_path: Path) -> str:
+def save_image(image: np.ndarray, file_path: Path, bilevel: bool = False) -> str:
     """
     Save image to file.
     
     Args:
         image: Image as numpy array (BGR)
         file_path: Output file path
+        bilevel: Write a binary (0/255) mask as a 1-bit PNG
         
     Returns:
         File path as string
@@ -32,11 +39,17 @@ def save_image(image: np.ndarray, file_path: Path) -> str:
         StorageError: If save fails
     """
     try:
-        # Ensure directory exists
-        file_path.parent.mkdir(parents=True, exist_ok=True)
-        
         # Save image
-        success = cv2.imwrite(str(file_path), image)
+        # OpenCV's PNG defaults are already its fastest settings; only
+        # binary masks get the smaller, faster 1-bit encoding
+        params = [cv2.IMWRITE_PNG_BILEVEL, 1] if bilevel else []
+        success = cv2.imwrite(str(file_path), image, params)
+        
+        # The directory normally exists already; create it only if the
+        # write failed because it is missing, then retry once
+        if not success and not file_path.parent.is_dir():
+            file_path.parent.mkdir(parents=True, exist_ok=True)
+            success = cv2.imwrite(str(file_path), image, params)
         
         if not success:
             raise StorageError(f"Failed to write image to {file_path}")
@@ -69,6 +82,22 @@ def save_result(job_id: str, result_image: np.ndarray) -> str:
     return f"/results/{job_id}.png"
 
 
+def _write_bytes_atomic(file_path: Path, data: bytes):
+    """Write data to a temporary file in one call, then rename it into place."""
+    tmp_path = file_path.with_name(file_path.name + ".tmp")
+    tmp_path.write_bytes(data)
+    os.replace(tmp_path, file_path)
+
+
+def _write_artifact(write: Callable, *args):
+    """Run an artifact write on the I/O pool, logging instead of raising."""
+    try:
+        write(*args)
+    except Exception as e:
+        # Don't fail the job if debug artifacts fail
+        print(f"Warning: Failed to save debug artifact: {e}")
+
+
 def save_debug_artifacts(
     job_id: str,
     person_mask: Optional[np.ndarray] = None,
@@ -80,6 +109,10 @@ def save_debug_artifacts(
     """
     Save debug artifacts for analysis.
     
+    Writes are queued on a background thread pool and this returns
+    immediately; artifact files appear shortly after. The arrays must not
+    be modified afterwards.
+    
     Args:
         job_id: Job identifier
         person_mask: Person segmentation mask
@@ -90,46 +123,38 @@ def save_debug_artifacts(
         
     Returns:
         Dictionary of artifact names to URLs
-        
-    Raises:
-        StorageError: If save fails
     """
     if not settings.save_debug_artifacts:
         return {}
     
     artifacts = {}
     artifact_dir = settings.artifacts_path / job_id
-    artifact_dir.mkdir(parents=True, exist_ok=True)
     
     try:
-        # Save masks
-        if person_mask is not None:
-            path = artifact_dir / "person_mask.png"
-            save_image(person_mask, path)
-            artifacts['person_mask'] = f"/artifacts/{job_id}/person_mask.png"
-        
-        if torso_mask is not None:
-            path = artifact_dir / "torso_mask.png"
-            save_image(torso_mask, path)
-            artifacts['torso_mask'] = f"/artifacts/{job_id}/torso_mask.png"
-        
-        if garment_mask is not None:
-            path = artifact_dir / "garment_mask.png"
-            save_image(garment_mask, path)
-            artifacts['garment_mask'] = f"/artifacts/{job_id}/garment_mask.png"
-        
-        # Save draft composite
-        if draft_composite is not None:
-            path = artifact_dir / "draft_composite.png"
-            save_image(draft_composite, path)
-            artifacts['draft_composite'] = f"/artifacts/{job_id}/draft_composite.png"
+        # Per-job directory: created directly, not memoized
+        artifact_dir.mkdir(parents=True, exist_ok=True)
+        
+        # Save masks (binary, written as 1-bit PNGs) and draft composite
+        images = {
+            'person_mask': (person_mask, True),
+            'torso_mask': (torso_mask, True),
+            'garment_mask': (garment_mask, True),
+            'draft_composite': (draft_composite, False),
+        }
+        for name, (image, bilevel) in images.items():
+            if image is not None:
+                path = artifact_dir / f"{name}.png"
+                _IO_POOL.submit(_write_artifact, save_image, image, path, bilevel)
+                artifacts[name] = f"/artifacts/{job_id}/{name}.png"
         
         # Save keypoints as JSON
         if keypoints is not None:
             path = artifact_dir / "keypoints.json"
-            # Convert tuples to lists for JSON serialization
-            serializable_kp = {k: list(v) for k, v in keypoints.items()}
-            path.write_text(json.dumps(serializable_kp, indent=2))
+            # orjson takes tuples and NumPy values as they are. Artifact URLs
+            # are returned before the write, so readers must never see a
+            # partial file; the rename makes it appear complete.
+            data = orjson.dumps(keypoints, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_INDENT_2)
+            _IO_POOL.submit(_write_artifact, _write_bytes_atomic, path, data)
             artifacts['keypoints'] = f"/artifacts/{job_id}/keypoints.json"
         
         return artifacts
@@ -11,7 +11,9 @@ from .image_utils import (
     distance,
 )
 from .validation import (
+    MIME_TYPE_EXTENSIONS,
     validate_image_format,
+    validate_image_signature,
     validate_image_size,
     validate_image_dimensions,
     validate_url,
@@ -27,7 +29,9 @@ __all__ = [
     "get_bounding_box",
     "calculate_angle",
     "distance",
+    "MIME_TYPE_EXTENSIONS",
     "validate_image_format",
+    "validate_image_signature",
     "validate_image_size",
     "validate_image_dimensions",
     "validate_url",
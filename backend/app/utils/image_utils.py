@@ -1,11 +1,21 @@
 """Common image processing utilities."""
 import cv2
+import math
 import numpy as np
-from PIL import Image, ExifTags
+from functools import lru_cache
+from PIL import Image, ImageOps, ExifTags
 from typing import Tuple, Optional
 from pathlib import Path
 
 
+@lru_cache(maxsize=16)
+def _kernel(shape: int, size: int) -> np.ndarray:
+    """Structuring element, built once per (shape, size) and shared read-only."""
+    kernel = cv2.getStructuringElement(shape, (size, size))
+    kernel.flags.writeable = False
+    return kernel
+
+
 def auto_rotate_image(image: Image.Image) -> Image.Image:
     """
     Auto-rotate image based on EXIF orientation.
@@ -17,22 +27,18 @@ def auto_rotate_image(image: Image.Image) -> Image.Image:
         Rotated PIL Image
     """
     try:
-        exif = image._getexif()
-        if exif is not None:
-            for tag, value in exif.items():
-                if tag in ExifTags.TAGS and ExifTags.TAGS[tag] == 'Orientation':
-                    if value == 3:
-                        image = image.rotate(180, expand=True)
-                    elif value == 6:
-                        image = image.rotate(270, expand=True)
-                    elif value == 8:
-                        image = image.rotate(90, expand=True)
-                    break
-    except (AttributeError, KeyError, IndexError):
-        # No EXIF data or no orientation tag
-        pass
-    
-    return image
+        orientation = image.getexif().get(ExifTags.Base.Orientation, 1)
+    except Exception:
+        # Unreadable EXIF block
+        return image
+    
+    if orientation == 1:
+        # Upright already; exif_transpose would return a copy
+        return image
+    
+    # Lossless transpose for every orientation (including mirrored ones),
+    # rather than an interpolated rotate
+    return ImageOps.exif_transpose(image)
 
 
 def resize_maintain_aspect(
@@ -71,18 +77,20 @@ def smooth_mask(mask: np.ndarray, kernel_size: int = 5) -> np.ndarray:
         kernel_size: Size of morphological kernel
         
     Returns:
-        Smoothed mask
+        Smoothed binary mask (0 or 255)
     """
-    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (kernel_size, kernel_size))
+    kernel = _kernel(cv2.MORPH_ELLIPSE, kernel_size)
     
     # Close small holes
     mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, kernel)
     
-    # Open to remove small noise
-    mask = cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel)
+    # Open to remove small noise (in place on the closed mask)
+    cv2.morphologyEx(mask, cv2.MORPH_OPEN, kernel, dst=mask)
     
-    # Slight blur for smooth edges
-    mask = cv2.GaussianBlur(mask, (5, 5), 0)
+    # Grow edges by 2px. Callers only use mask > 0, and the nonzero
+    # footprint of a 5x5 Gaussian blur on a binary mask is exactly a 5x5
+    # dilation, so this keeps the same mask without the gray fringe.
+    cv2.dilate(mask, _kernel(cv2.MORPH_RECT, 5), dst=mask)
     
     return mask
 
@@ -98,18 +106,19 @@ def remove_small_components(mask: np.ndarray, min_size: int = 1000) -> np.ndarra
     Returns:
         Cleaned mask
     """
-    # Find connected components
-    num_labels, labels, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
-    
-    # Create output mask
-    output = np.zeros_like(mask)
+    # Find connected components. Only areas are needed, so skip the
+    # bounding boxes and centroids of the stats variant and count label
+    # pixels in one bincount pass.
+    num_labels, labels = cv2.connectedComponents(mask, connectivity=8)
+    areas = np.bincount(labels.ravel(), minlength=num_labels)
     
-    # Keep only large components (skip label 0 which is background)
-    for i in range(1, num_labels):
-        if stats[i, cv2.CC_STAT_AREA] >= min_size:
-            output[labels == i] = 255
+    # Per-label lookup table: 255 for large components, 0 otherwise
+    # (label 0 is background)
+    keep = np.where(areas >= min_size, 255, 0).astype(mask.dtype)
+    keep[0] = 0
     
-    return output
+    # One gather over the label image instead of one pass per component
+    return keep[labels]
 
 
 def pil_to_cv2(pil_image: Image.Image) -> np.ndarray:
@@ -118,8 +127,9 @@ def pil_to_cv2(pil_image: Image.Image) -> np.ndarray:
     if pil_image.mode != 'RGB':
         pil_image = pil_image.convert('RGB')
     
-    # Convert to numpy array and change RGB to BGR
-    cv2_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+    # Swap RGB to BGR straight from the PIL buffer (asarray avoids an
+    # intermediate copy; cvtColor writes the only new array)
+    cv2_image = cv2.cvtColor(np.asarray(pil_image), cv2.COLOR_RGB2BGR)
     
     return cv2_image
 
@@ -134,23 +144,26 @@ def cv2_to_pil(cv2_image: np.ndarray) -> Image.Image:
 
 def get_bounding_box(mask: np.ndarray) -> Optional[Tuple[int, int, int, int]]:
     """
-    Get bounding box of mask.
+    Get bounding box of the largest component of a mask.
     
     Args:
         mask: Binary mask
         
     Returns:
-        (x, y, w, h) or None if mask is empty
+        (x, y, w, h) of the largest connected component, or None if mask is empty
     """
-    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    # One labeling pass gives every component's box and area; no contours
+    # need to be traced
+    num_labels, _, stats, _ = cv2.connectedComponentsWithStats(mask, connectivity=8)
     
-    if not contours:
+    if num_labels < 2:
         return None
     
-    # Get largest contour
-    largest_contour = max(contours, key=cv2.contourArea)
+    # Label 0 is background
+    largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    x, y, w, h = stats[largest, :4]
     
-    return cv2.boundingRect(largest_contour)
+    return int(x), int(y), int(w), int(h)
 
 
 def calculate_angle(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
@@ -167,9 +180,10 @@ def calculate_angle(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
     dx = p2[0] - p1[0]
     dy = p2[1] - p1[1]
     
-    return np.degrees(np.arctan2(dy, dx))
+    # Scalar inputs: math avoids NumPy's per-call ufunc dispatch
+    return math.degrees(math.atan2(dy, dx))
 
 
 def distance(p1: Tuple[float, float], p2: Tuple[float, float]) -> float:
     """Calculate Euclidean distance between two points."""
-    return np.sqrt((p2[0] - p1[0])**2 + (p2[1] - p1[1])**2)
+    return math.hypot(p2[0] - p1[0], p2[1] - p1[1])
@@ -7,6 +7,18 @@ from PIL import Image
 ALLOWED_FORMATS = {'.jpg', '.jpeg', '.png'}
 ALLOWED_MIME_TYPES = {'image/jpeg', 'image/png'}
 
+# File extension used when storing an upload of each allowed MIME type
+MIME_TYPE_EXTENSIONS = {
+    'image/jpeg': '.jpg',
+    'image/png': '.png',
+}
+
+# Leading bytes identifying each allowed format
+IMAGE_SIGNATURES = (
+    b'\xff\xd8\xff',                 # JPEG
+    b'\x89PNG\r\n\x1a\n',          # PNG
+)
+
 
 def validate_image_format(file_path: Path) -> bool:
     """
@@ -22,6 +34,19 @@ def validate_image_format(file_path: Path) -> bool:
     return suffix in ALLOWED_FORMATS
 
 
+def validate_image_signature(data: bytes) -> bool:
+    """
+    Validate that image bytes start with a supported format signature.
+    
+    Args:
+        data: Image bytes (only the first few bytes are inspected)
+        
+    Returns:
+        True if the content is JPEG or PNG
+    """
+    return data.startswith(IMAGE_SIGNATURES)
+
+
 def validate_image_size(file_path: Path, max_size_mb: int) -> bool:
     """
     Validate that image file size is within limits.
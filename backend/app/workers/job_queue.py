@@ -1,18 +1,70 @@
 """In-memory job queue management."""
 import asyncio
-from typing import Dict, Optional
+import time
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
 from datetime import datetime
 
+from ..config import settings
 from ..models.job import Job, JobStatus
 
 
+# Statuses after which a job no longer changes
+TERMINAL_STATUSES = (JobStatus.DONE, JobStatus.FAILED)
+
+
 class JobQueue:
-    """Thread-safe in-memory job queue."""
+    """
+    In-memory job queue.
+    
+    Used only from the event loop. No method awaits while touching the
+    jobs dict or the counters, so each update is atomic without a lock.
+    """
     
     def __init__(self):
         self.jobs: Dict[str, Job] = {}
         self.queue: asyncio.Queue = asyncio.Queue()
-        self.lock = asyncio.Lock()
+        
+        # Per-status job counts, kept in step by submit_job/update_job so
+        # get_stats never scans the jobs. Job objects are mutated in place,
+        # so the last counted status of each job is tracked separately.
+        self.status_counts: Dict[JobStatus, int] = {status: 0 for status in JobStatus}
+        self._counted_status: Dict[str, JobStatus] = {}
+        
+        # Finished jobs in completion order, as (monotonic time, job ID),
+        # so expired ones are found at the front without a scan
+        self._finished: Deque[Tuple[float, str]] = deque()
+    
+    def _count_status(self, job: Job):
+        """Move the job's count to its current status (no awaits inside)."""
+        status = JobStatus(job.status)
+        previous = self._counted_status.get(job.job_id)
+        
+        if previous == status:
+            return
+        
+        if previous is not None:
+            self.status_counts[previous] -= 1
+        self.status_counts[status] += 1
+        self._counted_status[job.job_id] = status
+        
+        if status in TERMINAL_STATUSES:
+            self._finished.append((time.monotonic(), job.job_id))
+    
+    def _evict_expired(self):
+        """Drop finished jobs older than job_ttl_seconds (no awaits inside)."""
+        if settings.job_ttl_seconds <= 0:
+            return
+        
+        cutoff = time.monotonic() - settings.job_ttl_seconds
+        while self._finished and self._finished[0][0] < cutoff:
+            _, job_id = self._finished.popleft()
+            
+            status = self._counted_status.get(job_id)
+            if status in TERMINAL_STATUSES:
+                del self.jobs[job_id]
+                del self._counted_status[job_id]
+                self.status_counts[status] -= 1
     
     async def submit_job(self, job: Job) -> str:
         """
@@ -24,24 +76,24 @@ class JobQueue:
         Returns:
             Job ID
         """
-        async with self.lock:
-            self.jobs[job.job_id] = job
-            await self.queue.put(job.job_id)
+        self._evict_expired()
+        self.jobs[job.job_id] = job
+        self._count_status(job)
+        self.queue.put_nowait(job.job_id)
         
         return job.job_id
     
-    async def get_next_job(self) -> Optional[str]:
+    async def get_next_job(self) -> str:
         """
-        Get next job ID from queue.
+        Get next job ID from queue, waiting until one is available.
+        
+        The waiting worker is woken as soon as a job is queued, instead of
+        polling with a timeout.
         
         Returns:
-            Job ID or None if queue is empty
+            Job ID
         """
-        try:
-            job_id = await asyncio.wait_for(self.queue.get(), timeout=1.0)
-            return job_id
-        except asyncio.TimeoutError:
-            return None
+        return await self.queue.get()
     
     async def get_job(self, job_id: str) -> Optional[Job]:
         """
@@ -53,8 +105,7 @@ class JobQueue:
         Returns:
             Job or None if not found
         """
-        async with self.lock:
-            return self.jobs.get(job_id)
+        return self.jobs.get(job_id)
     
     async def update_job(self, job: Job):
         """
@@ -63,9 +114,10 @@ class JobQueue:
         Args:
             job: Updated job
         """
-        async with self.lock:
-            job.updated_at = datetime.utcnow()
-            self.jobs[job.job_id] = job
+        job.updated_at = datetime.utcnow()
+        self.jobs[job.job_id] = job
+        self._count_status(job)
+        self._evict_expired()
     
     async def requeue_job(self, job_id: str):
         """
@@ -74,7 +126,7 @@ class JobQueue:
         Args:
             job_id: Job identifier
         """
-        await self.queue.put(job_id)
+        self.queue.put_nowait(job_id)
     
     def get_stats(self) -> Dict[str, int]:
         """
@@ -83,24 +135,15 @@ class JobQueue:
         Returns:
             Dictionary with queue stats
         """
+        counts = self.status_counts
         stats = {
             'total': len(self.jobs),
-            'queued': 0,
-            'processing': 0,
-            'done': 0,
-            'failed': 0
+            'queued': counts[JobStatus.QUEUED],
+            'processing': counts[JobStatus.PROCESSING],
+            'done': counts[JobStatus.DONE],
+            'failed': counts[JobStatus.FAILED]
         }
         
-        for job in self.jobs.values():
-            if job.status == JobStatus.QUEUED:
-                stats['queued'] += 1
-            elif job.status == JobStatus.PROCESSING:
-                stats['processing'] += 1
-            elif job.status == JobStatus.DONE:
-                stats['done'] += 1
-            elif job.status == JobStatus.FAILED:
-                stats['failed'] += 1
-        
         return stats
 
 
@@ -4,6 +4,7 @@ import traceback
 from typing import Optional
 
 from .job_queue import job_queue
+from ..config import settings
 from ..models.job import Job, JobStatus, ErrorCode
 from ..services import image_loader, segmentation, pose_detector, garment_prep, alignment, quality_control, nano_api, storage
 
@@ -27,41 +28,43 @@ async def process_job(job: Job) -> bool:
         
         # Stage 0: Load and normalize images
         print(f"  Stage 0: Loading images...")
-        person_image, _ = await image_loader.load_and_normalize(
+        person_image = await image_loader.load_and_normalize(
             image_url=job.user_image_url,
             image_path=job.user_image_path
         )
         
-        garment_image, _ = await image_loader.load_and_normalize(
+        garment_image = await image_loader.load_and_normalize(
             image_url=job.product_image_url,
             image_path=job.product_image_path
         )
         
         # Stage 2: Detect pose (before segmentation to optionally use for torso extraction)
         print(f"  Stage 2: Detecting pose...")
-        person_keypoints = pose_detector.detect_pose(person_image, person_mask=None)
+        person_keypoints = await asyncio.to_thread(pose_detector.detect_pose, person_image, None)
         
         # Stage 1: Segment person
         print(f"  Stage 1: Segmenting person...")
-        masks = segmentation.segment_person(person_image, person_keypoints)
+        masks = await asyncio.to_thread(segmentation.segment_person, person_image, person_keypoints)
         person_mask = masks['person']
         torso_mask = masks['torso']
         arms_mask = masks['arms']
         
         # Re-detect pose with person mask as fallback
         if len(person_keypoints) < 2:
-            person_keypoints = pose_detector.detect_pose(person_image, person_mask)
+            person_keypoints = await asyncio.to_thread(pose_detector.detect_pose, person_image, person_mask)
         
         # Stage 3: Prepare garment
         print(f"  Stage 3: Preparing garment...")
-        garment_rgba, garment_mask, garment_anchors = garment_prep.prepare_garment(
+        garment_rgba, garment_mask, garment_anchors = await asyncio.to_thread(
+            garment_prep.get_prepared_garment,
             garment_image,
-            garment_type=job.garment_type
+            job.garment_type
         )
         
         # Stage 4: Align and composite
         print(f"  Stage 4: Aligning and compositing...")
-        draft_composite, transformed_garment_mask, transform_params = alignment.align_and_composite(
+        draft_composite, transformed_garment_mask, transform_params = await asyncio.to_thread(
+            alignment.align_and_composite,
             person_image=person_image,
             person_keypoints=person_keypoints,
             garment_image=garment_rgba,
@@ -73,7 +76,8 @@ async def process_job(job: Job) -> bool:
         
         # Stage 5: Quality control
         print(f"  Stage 5: Quality control...")
-        quality_score, quality_passed = quality_control.quality_control(
+        quality_score, quality_passed = await asyncio.to_thread(
+            quality_control.quality_control,
             garment_anchors=garment_anchors,
             person_keypoints=person_keypoints,
             garment_mask=transformed_garment_mask,
@@ -115,7 +119,7 @@ async def process_job(job: Job) -> bool:
         
         # Stage 7: Save result
         print(f"  Stage 7: Saving result...")
-        result_url = storage.save_result(job.job_id, final_result)
+        result_url = await asyncio.to_thread(storage.save_result, job.job_id, final_result)
         
         # Save debug artifacts if enabled
         debug_artifacts = storage.save_debug_artifacts(
@@ -191,18 +195,19 @@ async def worker_loop():
     """
     Background worker that continuously processes jobs from the queue.
     """
+    # Load the segmentation model before the first job arrives
+    try:
+        await asyncio.to_thread(segmentation.get_session)
+    except Exception as e:
+        print(f"Warning: Failed to preload segmentation model: {e}")
+    
     print("Worker started, waiting for jobs...")
     
     while True:
         try:
-            # Get next job from queue
+            # Get next job from queue (waits until one is submitted)
             job_id = await job_queue.get_next_job()
             
-            if job_id is None:
-                # No jobs, wait a bit
-                await asyncio.sleep(0.1)
-                continue
-            
             # Get job data
             job = await job_queue.get_job(job_id)
             
@@ -219,5 +224,6 @@ async def worker_loop():
 
 
 def start_worker():
-    """Start the background worker in a new task."""
-    asyncio.create_task(worker_loop())
+    """Start the background workers, one task per concurrent job."""
+    for _ in range(settings.job_concurrency):
+        asyncio.create_task(worker_loop())
@@ -3,76 +3,182 @@
 Quick test script to verify the AI Try-On service setup.
 Run this to check if all dependencies are properly installed.
 """
+import contextlib
+import functools
+import hashlib
+import importlib
+import importlib.util
+import io
+import json
+import os
+import site
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from importlib.metadata import PackageNotFoundError, version as distribution_version
+from pathlib import Path
 
-def check_imports():
-    """Check if all required packages can be imported."""
-    print("Checking imports...")
-    
+
+# Status marks; plain ASCII when stdout cannot encode the symbols
+# (e.g. Windows cp1252 consoles)
+if (sys.stdout.encoding or "").lower().replace("-", "").startswith("utf"):
+    OK_MARK, FAIL_MARK, WARN_MARK = "✓", "✗", "⚠"
+else:
+    OK_MARK, FAIL_MARK, WARN_MARK = "[OK]", "[FAIL]", "[WARN]"
+
+# Package status lines, built once with the mark already in place
+MODULE_OK_FORMAT = OK_MARK + " %s %s"
+MODULE_FAILURE_FORMAT = "  %-*s  %s"
+
+
+# Required packages as (display name, import name, distribution names).
+# Versions come from the distribution's metadata; OpenCV ships under
+# several distribution names providing the same cv2 module.
+MODULES = [
+    ("FastAPI", "fastapi", ("fastapi",)),
+    ("OpenCV", "cv2", (
+        "opencv-python",
+        "opencv-contrib-python",
+        "opencv-python-headless",
+        "opencv-contrib-python-headless"
+    )),
+    ("NumPy", "numpy", ("numpy",)),
+    ("Pillow (PIL)", "PIL", ("Pillow",)),
+    ("MediaPipe", "mediapipe", ("mediapipe",)),
+    ("rembg", "rembg", ("rembg",)),
+    ("httpx", "httpx", ("httpx",)),
+    ("Pydantic", "pydantic", ("pydantic",)),
+    ("Uvicorn", "uvicorn", ("uvicorn",)),
+]
+
+
+# Result of the last passing import check, reused while packages are unchanged
+STAMP_PATH = Path(__file__).parent / ".pytest_cache" / "test_setup_stamp.json"
+
+
+def _packages_key():
+    """Digest of the module table and the mtimes of the site-packages dirs."""
+    dirs = site.getsitepackages() + [site.getusersitepackages()]
+    mtimes = sorted((d, os.path.getmtime(d)) for d in dirs if os.path.isdir(d))
+    return hashlib.blake2b(repr((MODULES, mtimes)).encode()).hexdigest()
+
+
+def _read_stamp():
+    """Load the stamp file, or an empty dict if missing or unreadable."""
     try:
-        import fastapi
-        print(f"✓ FastAPI {fastapi.__version__}")
-    except ImportError as e:
-        print(f"✗ FastAPI import failed: {e}")
-        return False
-    
+        return json.loads(STAMP_PATH.read_text())
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_stamp(key, ok):
+    """Record the import check result; failures to write are ignored."""
     try:
-        import cv2
-        print(f"✓ OpenCV {cv2.__version__}")
-    except ImportError as e:
-        print(f"✗ OpenCV import failed: {e}")
-        return False
-    
+        STAMP_PATH.parent.mkdir(parents=True, exist_ok=True)
+        STAMP_PATH.write_text(json.dumps({"key": key, "ok": ok, "ts": time.time()}))
+    except OSError:
+        pass
+
+
+def _available(module_name):
+    """Whether a module is installed, found without executing it."""
     try:
-        import numpy
-        print(f"✓ NumPy {numpy.__version__}")
-    except ImportError as e:
-        print(f"✗ NumPy import failed: {e}")
+        return importlib.util.find_spec(module_name) is not None
+    except (ImportError, ValueError):
         return False
+
+
+class LazyImport:
+    """Module proxy that imports the module on first attribute access."""
     
-    try:
-        from PIL import Image
-        print(f"✓ Pillow (PIL)")
-    except ImportError as e:
-        print(f"✗ Pillow import failed: {e}")
-        return False
+    def __init__(self, name):
+        self._name = name
+        self._module = None
     
-    try:
-        import mediapipe
-        print(f"✓ MediaPipe {mediapipe.__version__}")
-    except ImportError as e:
-        print(f"✗ MediaPipe import failed: {e}")
-        return False
+    def __getattr__(self, item):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, item)
+
+
+def _version(module_name, distributions, import_fallback):
+    """
+    Version of an installed package.
     
-    try:
-        import rembg
-        print(f"✓ rembg")
-    except ImportError as e:
-        print(f"✗ rembg import failed: {e}")
-        return False
+    Read from the first installed distribution's metadata, without
+    importing anything. Only when no metadata exists (e.g. a source
+    checkout on sys.path) and import_fallback is set is the module
+    imported for its __version__.
     
-    try:
-        import httpx
-        print(f"✓ httpx {httpx.__version__}")
-    except ImportError as e:
-        print(f"✗ httpx import failed: {e}")
-        return False
+    Returns:
+        Version string, or "" if unknown
+    """
+    for distribution in distributions:
+        try:
+            return distribution_version(distribution)
+        except PackageNotFoundError:
+            continue
     
-    try:
-        import pydantic
-        print(f"✓ Pydantic {pydantic.__version__}")
-    except ImportError as e:
-        print(f"✗ Pydantic import failed: {e}")
-        return False
+    if not import_fallback:
+        return ""
+    return getattr(LazyImport(module_name), "__version__", "")
+
+
+def _probe(label, module_name, distributions, import_fallback):
+    """Check one module; return (label, version, error message or None)."""
+    if not _available(module_name):
+        return label, "", f"No module named '{module_name}'"
     
     try:
-        import uvicorn
-        print(f"✓ Uvicorn {uvicorn.__version__}")
+        return label, _version(module_name, distributions, import_fallback), None
     except ImportError as e:
-        print(f"✗ Uvicorn import failed: {e}")
-        return False
+        return label, "", str(e)
+
+
+def check_imports():
+    """
+    Check if all required packages are installed.
+    
+    Packages are located and their versions read from installed
+    metadata without importing them (the app import check still loads
+    everything). Pass --versions to import packages that have no
+    metadata for their __version__.
+    """
+    print("Checking imports...")
     
-    return True
+    import_fallback = "--versions" in sys.argv
+    
+    # Installing or removing a package touches its site-packages directory,
+    # so an unchanged key means the last passing check still holds
+    key = _packages_key()
+    if not import_fallback:
+        stamp = _read_stamp()
+        if stamp.get("key") == key and stamp.get("ok"):
+            print(f"{OK_MARK} imports (cached)")
+            return True
+    
+    # Probes are independent; any fallback imports of large native
+    # packages overlap their file reads. Results keep table order.
+    with ThreadPoolExecutor(max_workers=min(8, len(MODULES))) as executor:
+        results = list(executor.map(lambda entry: _probe(*entry, import_fallback), MODULES))
+    
+    failures = []
+    for label, version, error in results:
+        if error is not None:
+            failures.append((label, error.splitlines()[0]))
+        else:
+            print((MODULE_OK_FORMAT % (label, version)).rstrip())
+    
+    # Failures go in one aligned block after the successes
+    if failures:
+        width = max(len(label) for label, _ in failures)
+        print(f"{FAIL_MARK} Import failures:")
+        for label, error in failures:
+            print(MODULE_FAILURE_FORMAT % (width, label, error))
+    
+    ok = not failures
+    _write_stamp(key, ok)
+    return ok
 
 
 def check_config():
@@ -81,32 +187,49 @@ def check_config():
     
     try:
         from app.config import settings
-        print(f"✓ Configuration loaded")
+        print(f"{OK_MARK} Configuration loaded")
         print(f"  - Storage path: {settings.storage_path}")
         print(f"  - API URL: {settings.nano_banana_api_url}")
         print(f"  - Debug mode: {settings.debug}")
         
         if settings.nano_banana_api_key == "your_api_key_here":
-            print("  ⚠ Warning: Nano Banana API key not configured (using placeholder)")
+            print(f"  {WARN_MARK} Warning: Nano Banana API key not configured (using placeholder)")
             print("    Edit .env and add your API key for production use")
         else:
-            print(f"  ✓ API key configured")
+            print(f"  {OK_MARK} API key configured")
+        
+        return True
+    except Exception as e:
+        print(f"{FAIL_MARK} Configuration failed: {e}")
+        return False
+
+
+def ensure_directories():
+    """Create any missing storage directories."""
+    print("\nCreating storage directories...")
+    
+    try:
+        from app.config import settings
         
+        settings.ensure_directories()
+        print(f"{OK_MARK} Storage directories ready under {settings.storage_path}")
         return True
     except Exception as e:
-        print(f"✗ Configuration failed: {e}")
+        print(f"{FAIL_MARK} Creating directories failed: {e}")
         return False
 
 
 def check_directories():
-    """Check if storage directories exist."""
+    """Check if storage directories exist (read-only)."""
     print("\nChecking directories...")
     
     try:
-        from pathlib import Path
         from app.config import settings
         
-        settings.ensure_directories()
+        # All four live directly under storage_path; one directory listing
+        # replaces a stat per path (d_type usually answers is_dir)
+        with os.scandir(settings.storage_path) as entries:
+            present = {entry.name for entry in entries if entry.is_dir()}
         
         for name, path in [
             ("Uploads", settings.uploads_path),
@@ -114,15 +237,15 @@ def check_directories():
             ("Results", settings.results_path),
             ("Artifacts", settings.artifacts_path)
         ]:
-            if path.exists():
-                print(f"✓ {name} directory: {path}")
+            if path.name in present:
+                print(f"{OK_MARK} {name} directory: {path}")
             else:
-                print(f"✗ {name} directory missing: {path}")
+                print(f"{FAIL_MARK} {name} directory missing: {path}")
                 return False
         
         return True
     except Exception as e:
-        print(f"✗ Directory check failed: {e}")
+        print(f"{FAIL_MARK} Directory check failed: {e}")
         return False
 
 
@@ -132,17 +255,40 @@ def test_app_import():
     
     try:
         from app.main import app
-        print(f"✓ FastAPI app imported successfully")
+        print(f"{OK_MARK} FastAPI app imported successfully")
         print(f"  - Title: {app.title}")
         print(f"  - Version: {app.version}")
         return True
     except Exception as e:
-        print(f"✗ App import failed: {e}")
+        print(f"{FAIL_MARK} App import failed: {e}")
         return False
 
 
-def main():
-    """Run all checks."""
+# Checks that cannot pass unless these earlier checks passed; they are
+# skipped instead of failing again with the same error
+CHECK_PREREQUISITES = {
+    "Storage Setup": {"Configuration"},
+    "Directories": {"Configuration"},
+    "App Import": {"Package Imports", "Configuration"},
+}
+
+
+@functools.lru_cache(maxsize=1)
+def verify() -> bool:
+    """
+    Run all checks and print the report.
+    
+    The result is cached, so repeated calls in one process (e.g. from a
+    conftest) return immediately without re-running or re-printing.
+    
+    A check is skipped when one of its prerequisites did not pass. The
+    app import loads the whole inference stack, so --quick skips it too.
+    --dry-run skips creating missing storage directories, so only
+    existing ones pass.
+    
+    Returns:
+        True if no check failed
+    """
     print("=" * 60)
     print("AI Virtual Try-On Service - Setup Verification")
     print("=" * 60)
@@ -150,12 +296,26 @@ def main():
     checks = [
         ("Package Imports", check_imports),
         ("Configuration", check_config),
+        ("Storage Setup", ensure_directories),
         ("Directories", check_directories),
         ("App Import", test_app_import)
     ]
     
+    quick = "--quick" in sys.argv
+    dry_run = "--dry-run" in sys.argv
+    
     results = []
     for name, check_func in checks:
+        passed = {check_name for check_name, result in results if result}
+        skip = (
+            not CHECK_PREREQUISITES.get(name, set()) <= passed
+            or (name == "Storage Setup" and dry_run)
+            or (name == "App Import" and quick)
+        )
+        if skip:
+            results.append((name, None))
+            continue
+        
         print()
         result = check_func()
         results.append((name, result))
@@ -166,7 +326,10 @@ def main():
     
     all_passed = True
     for name, result in results:
-        status = "✓ PASS" if result else "✗ FAIL"
+        if result is None:
+            print(f"- SKIP: {name}")
+            continue
+        status = f"{OK_MARK} PASS" if result else f"{FAIL_MARK} FAIL"
         print(f"{status}: {name}")
         if not result:
             all_passed = False
@@ -174,16 +337,29 @@ def main():
     print("=" * 60)
     
     if all_passed:
-        print("✓ All checks passed! Service is ready to run.")
+        print(f"{OK_MARK} All checks passed! Service is ready to run.")
         print("\nTo start the service, run:")
         print("  python -m app.main")
         print("  or")
         print("  uvicorn app.main:app --reload")
-        return 0
     else:
-        print("✗ Some checks failed. Please fix the issues above.")
-        return 1
+        print(f"{FAIL_MARK} Some checks failed. Please fix the issues above.")
+    
+    return all_passed
+
+
+def main():
+    """Run all checks; return the process exit code."""
+    return 0 if verify() else 1
 
 
 if __name__ == "__main__":
-    sys.exit(main())
+    # Collect the report and emit it in a single write
+    buffer = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(buffer):
+            exit_code = main()
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
+    sys.exit(exit_code)
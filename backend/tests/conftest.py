@@ -1,9 +1,38 @@
 """Test utilities and pytest configuration."""
+from pathlib import Path
+
+import cv2
 import pytest
 
 
-@pytest.fixture
+# Sample images shipped next to the tests
+_SAMPLE_DIR = Path(__file__).parent / "sample_images"
+_SAMPLE_SUFFIXES = {".jpg", ".jpeg", ".png"}
+
+
+@pytest.fixture(scope="session")
 def sample_image_dir():
     """Return path to sample images directory."""
-    from pathlib import Path
-    return Path(__file__).parent / "sample_images"
+    return _SAMPLE_DIR
+
+
+@pytest.fixture(scope="session")
+def sample_images(sample_image_dir):
+    """
+    Decode every sample image once per session.
+    
+    Arrays are shared between tests and therefore read-only; take a
+    .copy() before modifying one.
+    
+    Returns:
+        Dictionary of file stem to decoded image (BGR)
+    """
+    images = {}
+    for path in sorted(sample_image_dir.glob("*")):
+        if path.suffix.lower() not in _SAMPLE_SUFFIXES:
+            continue
+        image = cv2.imread(str(path))
+        if image is not None:
+            image.flags.writeable = False
+            images[path.stem] = image
+    return images
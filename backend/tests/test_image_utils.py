@@ -0,0 +1,16 @@
+"""Tests for common image processing utilities."""
+import numpy as np
+
+from app.utils.image_utils import get_bounding_box
+
+
+def test_get_bounding_box_empty_mask():
+    assert get_bounding_box(np.zeros((100, 100), dtype=np.uint8)) is None
+
+
+def test_get_bounding_box_uses_largest_component():
+    mask = np.zeros((100, 100), dtype=np.uint8)
+    mask[10:20, 10:20] = 255   # small blob
+    mask[70:90, 50:95] = 255   # large blob
+    
+    assert get_bounding_box(mask) == (50, 70, 45, 20)